@@ -3,18 +3,84 @@ Restaurant reservation tools for Claude AI function calling
 APPROACH 1: Proper table assignment - each reservation gets a specific table
 """
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from functools import lru_cache
+from typing import Dict, List, Any, Tuple
 import sys
 import os
-from fuzzywuzzy import fuzz
+from rapidfuzz import fuzz, process
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.services.database import get_db, Reservation, Table
+from app.services.database import get_db, Reservation, Table, parse_reservation_date, parse_reservation_time
 from app.services.sms_service import sms_service
 
 
+# Characters dropped when cleaning names (one translate pass instead of chained replaces)
+_NAME_CLEAN_TABLE = str.maketrans("", "", ". ")
+
+
+@lru_cache(maxsize=4096)
+def normalize_name(name: str) -> str:
+    """Clean a name for fuzzy matching (lowercase, no spaces or periods)"""
+    return name.lower().translate(_NAME_CLEAN_TABLE)
+
+
+def fuzzy_match_clean(clean_search: str, clean_db: str, threshold: int = 75) -> Tuple[bool, float]:
+    """
+    Fuzzy-match two names that are already cleaned with normalize_name.
+
+    Returns:
+        (matched, best similarity score 0-100; 0 when below threshold)
+    """
+    # Identical names need no scoring
+    if clean_search == clean_db:
+        return True, 100.0
+
+    search_len, db_len = len(clean_search), len(clean_db)
+    if not search_len or not db_len:
+        return False, 0.0
+
+    # The length gap alone caps ratio at this - skip its DP when that can't reach the threshold
+    ratio_bound = 100 * (1 - abs(search_len - db_len) / (search_len + db_len))
+
+    # Calculate similarity ratio
+    similarity = fuzz.ratio(clean_search, clean_db, score_cutoff=threshold) if ratio_bound >= threshold else 0.0
+
+    # Also try partial matching (for cases like "Rag" matching "Ragi") - not length-bounded.
+    # It only matters if it beats ratio, so let rapidfuzz stop early below that.
+    partial_similarity = fuzz.partial_ratio(clean_search, clean_db, score_cutoff=max(threshold, similarity))
+
+    # Use the higher of the two scores
+    best_match = max(similarity, partial_similarity)
+
+    return best_match >= threshold, best_match
+
+
+def fuzzy_match_many(search_name: str, database_names: List[str], threshold: int = 75) -> Dict[int, float]:
+    """
+    Fuzzy-match one name against a list of names in a single rapidfuzz pass per scorer.
+
+    Returns:
+        {index into database_names: best similarity score} for every name that matches
+    """
+    clean_search = normalize_name(search_name)
+    cleaned = [normalize_name(name) for name in database_names]
+
+    # Identical names need no scoring - only the rest go through rapidfuzz
+    scores = {i: 100.0 for i, clean_db in enumerate(cleaned) if clean_db == clean_search}
+    choices = {i: clean_db for i, clean_db in enumerate(cleaned) if i not in scores}
+
+    # Same rule as fuzzy_match_clean: best of ratio and partial ratio
+    for scorer in (fuzz.ratio, fuzz.partial_ratio):
+        for _, score, index in process.extract(clean_search, choices, scorer=scorer,
+                                               score_cutoff=threshold, limit=None):
+            if score > scores.get(index, 0):
+                scores[index] = score
+
+    return scores
+
+
 def fuzzy_match_name(search_name: str, database_name: str, threshold: int = 75) -> bool:
     """
     Check if two names match using fuzzy string matching.
@@ -32,20 +98,8 @@ def fuzzy_match_name(search_name: str, database_name: str, threshold: int = 75)
         fuzzy_match_name("John", "Jon") → True (85% match)
         fuzzy_match_name("R a g. I", "Ragi") → True (cleaned and matched)
     """
-    # Clean the names (remove extra spaces, periods, lowercase)
-    clean_search = search_name.lower().replace(".", "").replace(" ", "")
-    clean_db = database_name.lower().replace(".", "").replace(" ", "")
-
-    # Calculate similarity ratio
-    similarity = fuzz.ratio(clean_search, clean_db)
-
-    # Also try partial matching (for cases like "Rag" matching "Ragi")
-    partial_similarity = fuzz.partial_ratio(clean_search, clean_db)
-
-    # Use the higher of the two scores
-    best_match = max(similarity, partial_similarity)
-
-    return best_match >= threshold
+    matched, _ = fuzzy_match_clean(normalize_name(search_name), normalize_name(database_name), threshold)
+    return matched
 
 
 def get_current_date() -> Dict[str, Any]:
@@ -87,6 +141,16 @@ def check_availability(party_size: int, date: str, time: str) -> Dict[str, Any]:
     Returns:
         Dict with availability info and available table IDs
     """
+    try:
+        slot_date = parse_reservation_date(date)
+        slot_time = parse_reservation_time(time)
+    except ValueError:
+        return {
+            "available": False,
+            "reason": f"Invalid date/time '{date} {time}' - use YYYY-MM-DD and HH:MM (24-hour)",
+            "suggested_alternatives": []
+        }
+
     db = get_db()
     try:
         # STEP 1: Find ALL tables that can accommodate this party size
@@ -104,8 +168,8 @@ def check_availability(party_size: int, date: str, time: str) -> Dict[str, Any]:
 
         # STEP 2: Find which tables are ALREADY ASSIGNED for this date/time
         booked_reservations = db.query(Reservation).filter(
-            Reservation.date == date,
-            Reservation.time == time,
+            Reservation.reservation_date == slot_date,
+            Reservation.reservation_time == slot_time,
             Reservation.status == 'confirmed',
             Reservation.assigned_table_id.isnot(None)  # Only confirmed assignments
         ).all()
@@ -254,25 +318,27 @@ def get_reservations(date: str = None, name: str = None) -> List[Dict[str, Any]]
     Returns:
         List of reservation dictionaries
     """
+    try:
+        slot_date = parse_reservation_date(date) if date else None
+    except ValueError:
+        # Not a YYYY-MM-DD date - no reservation can be on it
+        return []
+
     db = get_db()
     try:
         query = db.query(Reservation).filter(Reservation.status == 'confirmed')
 
         # Filter by date if provided
-        if date:
-            query = query.filter(Reservation.date == date)
+        if slot_date:
+            query = query.filter(Reservation.reservation_date == slot_date)
 
         reservations = query.all()
 
         # If name provided, do fuzzy matching
         if name:
-            matched_reservations = []
-            for res in reservations:
-                # Try fuzzy matching with 75% threshold
-                if fuzzy_match_name(name, res.name, threshold=75):
-                    matched_reservations.append(res)
-
-            return [r.to_dict() for r in matched_reservations]
+            # Fuzzy match against every reservation at once with 75% threshold
+            matches = fuzzy_match_many(name, [res.name for res in reservations], threshold=75)
+            return [reservations[i].to_dict() for i in sorted(matches)]
 
         return [r.to_dict() for r in reservations]
 
@@ -293,6 +359,14 @@ def cancel_reservation(reservation_id: int = None, name: str = None, date: str =
     Returns:
         Dict with cancellation status
     """
+    try:
+        slot_date = parse_reservation_date(date) if date else None
+    except ValueError:
+        return {
+            "success": False,
+            "error": f"Invalid date '{date}' - use YYYY-MM-DD"
+        }
+
     db = get_db()
     try:
         if reservation_id:
@@ -307,32 +381,20 @@ def cancel_reservation(reservation_id: int = None, name: str = None, date: str =
             )
 
             # Filter by date if provided
-            if date:
-                query = query.filter(Reservation.date == date)
+            if slot_date:
+                query = query.filter(Reservation.reservation_date == slot_date)
 
             # Get all candidates and fuzzy match
             candidates = query.all()
 
             # Find best fuzzy match
-            best_match = None
-            best_score = 0
-
-            for res in candidates:
-                # Clean names for comparison
-                clean_search = name.lower().replace(".", "").replace(" ", "")
-                clean_db = res.name.lower().replace(".", "").replace(" ", "")
-
-                # Calculate similarity
-                similarity = max(
-                    fuzz.ratio(clean_search, clean_db),
-                    fuzz.partial_ratio(clean_search, clean_db)
-                )
+            matches = fuzzy_match_many(name, [res.name for res in candidates], threshold=75)
 
-                if similarity > best_score and similarity >= 75:
-                    best_score = similarity
-                    best_match = res
-
-            reservation = best_match
+            # Highest score wins; ties go to the earliest candidate
+            reservation = None
+            if matches:
+                best_index = max(sorted(matches), key=matches.get)
+                reservation = candidates[best_index]
         else:
             return {
                 "success": False,
@@ -387,19 +449,23 @@ def suggest_alternative_times(date: str, requested_time: str, party_size: int, d
     Checks actual table availability for each alternative.
     """
     alternatives = []
-    base_time = datetime.strptime(requested_time, "%H:%M")
+
+    # Work in minutes since midnight - no strptime/strftime round-trip per offset
+    requested = parse_reservation_time(requested_time)
+    base_minutes = requested.hour * 60 + requested.minute
 
     # Try ±30 min, ±1 hour, ±90 min
     time_offsets = [-90, -60, -30, 30, 60, 90]
 
     for offset in time_offsets:
-        alt_time = (base_time + timedelta(minutes=offset)).strftime("%H:%M")
+        alt_hour, alt_minute = divmod((base_minutes + offset) % (24 * 60), 60)
 
         # Make sure it's within restaurant hours (5pm - 10pm)
-        alt_hour = int(alt_time.split(':')[0])
         if alt_hour < 17 or alt_hour >= 22:  # Before 5pm or after 10pm
             continue
 
+        alt_time = f"{alt_hour:02d}:{alt_minute:02d}"
+
         # Check if this time is actually available
         # Re-use our check_availability function
         temp_db = get_db()
@@ -410,8 +476,8 @@ def suggest_alternative_times(date: str, requested_time: str, party_size: int, d
             ).all()
 
             booked = temp_db.query(Reservation).filter(
-                Reservation.date == date,
-                Reservation.time == alt_time,
+                Reservation.reservation_date == parse_reservation_date(date),
+                Reservation.reservation_time == parse_reservation_time(alt_time),
                 Reservation.status == 'confirmed',
                 Reservation.assigned_table_id.isnot(None)
             ).all()
@@ -2,9 +2,11 @@
 Main FastAPI application for phone agent
 Full production version with Claude AI, database, and tool calling
 """
-from app.services.metrics_tracker import start_tracking_call, get_tracker, end_tracking_call
-from fastapi import FastAPI, Request, Response
+from app.services.metrics_tracker import start_tracking_call, get_tracker, end_tracking_call_async
+from app.services.quality_worker import quality_queue, quality_worker
+from fastapi import BackgroundTasks, FastAPI, Request, Response
 from fastapi.staticfiles import StaticFiles
+import asyncio
 import os
 import json
 import time
@@ -14,11 +16,12 @@ from dotenv import load_dotenv
 # Import our LLM service
 import sys
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from services.llm import llm_service
+from services.llm import get_llm_service
 from services.database import init_db, get_db
 from agent.tools.reservation_tools import TOOL_DEFINITIONS, TOOL_FUNCTIONS
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from sqlalchemy import func
 
 import math
@@ -30,6 +33,9 @@ init_db()
 # Create FastAPI app
 app = FastAPI(title="Phone Agent API", version="3.0.0")
 
+# Compress dashboard HTML and chart-data JSON (small TwiML responses stay uncompressed)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Setup templates for dashboard
 templates_dir = os.path.join(os.path.dirname(__file__), "templates")
 if not os.path.exists(templates_dir):
@@ -50,6 +56,13 @@ app.mount("/static", StaticFiles(directory=static_dir), name="static")
 conversations = {}
 
 
+@app.on_event("startup")
+async def start_quality_worker():
+    """Start the background quality scoring worker"""
+    # Keep a reference so the task isn't garbage collected
+    app.state.quality_worker = asyncio.create_task(quality_worker())
+
+
 def parse_date_time(date_str: str, time_str: str) -> tuple:
     """
     Parse natural language date/time to standard format
@@ -168,7 +181,7 @@ async def process_speech(request: Request):
 
     # Call Claude with tools - this is the INDUSTRY PATTERN
     try:
-        response = llm_service.get_response_with_tools(
+        response = get_llm_service().get_response_with_tools(
             user_speech,
             conversation_history=messages,
             tools=TOOL_DEFINITIONS
@@ -246,7 +259,7 @@ async def process_speech(request: Request):
                 followup_start = time.time()
 
                 # Get Claude's response to the tool result
-                followup = llm_service.get_response_with_tools(
+                followup = get_llm_service().get_response_with_tools(
                     "",  # No new user message
                     conversation_history=messages,
                     tools=TOOL_DEFINITIONS
@@ -307,7 +320,7 @@ async def process_speech(request: Request):
                         final_start = time.time()
 
                         # Get Claude's final response after chained tool
-                        final_response = llm_service.get_response_with_tools(
+                        final_response = get_llm_service().get_response_with_tools(
                             "",
                             conversation_history=messages,
                             tools=TOOL_DEFINITIONS
@@ -369,8 +382,18 @@ async def process_speech(request: Request):
     return Response(content=twiml_response, media_type="application/xml")
 
 
+async def save_call_metrics(call_sid: str):
+    """Background task: save a finished call's metrics, then queue it for quality scoring"""
+    try:
+        if await end_tracking_call_async(call_sid):
+            await quality_queue.put(call_sid)
+    except Exception as e:
+        # Background task - nothing above us would report it
+        print(f"[{call_sid}] Error saving call metrics: {e}")
+
+
 @app.post("/call-ended")
-async def call_ended(request: Request):
+async def call_ended(request: Request, background_tasks: BackgroundTasks):
     """
     Twilio webhook called when call completes.
     This is where we finalize and save all metrics.
@@ -381,8 +404,8 @@ async def call_ended(request: Request):
 
     print(f"📞 Call ended: {call_sid} - Status: {call_status}")
 
-    # ✅ END TRACKING AND SAVE METRICS
-    end_tracking_call(call_sid)
+    # ✅ END TRACKING AND SAVE METRICS (after the response - don't make Twilio wait)
+    background_tasks.add_task(save_call_metrics, call_sid)
 
     # Clean up conversation memory
     if call_sid in conversations:
@@ -667,241 +690,285 @@ def calculate_t_statistic(sample1, sample2):
 
     return t_stat, p_value
 
-@app.get("/dashboard/ab-testing", response_class=HTMLResponse)
-async def dashboard_ab_testing(request: Request):
-    """A/B testing analysis dashboard"""
+# Radar/time-series colors per variant (fill, border)
+AB_VARIANT_COLORS = [
+    ('rgba(102, 126, 234, 0.2)', '#667eea'),
+    ('rgba(72, 187, 120, 0.2)', '#48bb78'),
+    ('rgba(237, 137, 54, 0.2)', '#ed8936'),
+]
+
+
+def _load_calls_by_variant(db) -> dict:
+    """All analyzed calls, grouped by prompt version"""
     from services.database import CallMetrics, CallQuality
 
-    db = get_db()
-    try:
-        # Get all calls grouped by prompt version
-        calls_by_variant = {}
-        all_calls = db.query(CallMetrics).join(CallQuality).all()
-
-        for call in all_calls:
-            variant = call.prompt_version
-            if variant not in calls_by_variant:
-                calls_by_variant[variant] = []
-            calls_by_variant[variant].append(call)
-
-        # Define variant descriptions
-        variant_info = {
-            "v1_baseline": {
-                "name": "v1_baseline",
-                "description": "Standard professional greeting, formal tone"
-            },
-            "v2_friendly": {
-                "name": "v2_friendly",
-                "description": "Warm greeting, casual friendly tone"
-            },
-            "v3_efficient": {
-                "name": "v3_efficient",
-                "description": "Brief greeting, get straight to business"
-            }
+    calls_by_variant = {}
+    for call in db.query(CallMetrics).join(CallQuality).all():
+        variant = call.prompt_version
+        if variant not in calls_by_variant:
+            calls_by_variant[variant] = []
+        calls_by_variant[variant].append(call)
+
+    return calls_by_variant
+
+
+def _ab_variant_stats(calls_by_variant: dict) -> list:
+    """Per-variant averages, in calls_by_variant order (shared by the page and its charts)"""
+    # Define variant descriptions
+    variant_info = {
+        "v1_baseline": {
+            "name": "v1_baseline",
+            "description": "Standard professional greeting, formal tone"
+        },
+        "v2_friendly": {
+            "name": "v2_friendly",
+            "description": "Warm greeting, casual friendly tone"
+        },
+        "v3_efficient": {
+            "name": "v3_efficient",
+            "description": "Brief greeting, get straight to business"
         }
+    }
+
+    variant_stats = []
+
+    for variant, calls in calls_by_variant.items():
+        if len(calls) == 0:
+            continue
+
+        # Calculate metrics
+        call_count = len(calls)
+        bookings = sum(1 for c in calls if c.booking_completed)
+        booking_rate = (bookings / call_count * 100) if call_count > 0 else 0
+
+        quality_scores = [c.quality.overall_score for c in calls if c.quality]
+        avg_quality = sum(quality_scores) / len(quality_scores) if quality_scores else 0
+
+        efficiency_scores = [c.quality.efficiency_score for c in calls if c.quality]
+        avg_efficiency = sum(efficiency_scores) / len(efficiency_scores) if efficiency_scores else 0
+
+        accuracy_scores = [c.quality.accuracy_score for c in calls if c.quality]
+        avg_accuracy = sum(accuracy_scores) / len(accuracy_scores) if accuracy_scores else 0
+
+        naturalness_scores = [c.quality.naturalness_score for c in calls if c.quality]
+        avg_naturalness = sum(naturalness_scores) / len(naturalness_scores) if naturalness_scores else 0
+
+        professionalism_scores = [c.quality.professionalism_score for c in calls if c.quality]
+        avg_professionalism = sum(professionalism_scores) / len(professionalism_scores) if professionalism_scores else 0
+
+        helpfulness_scores = [c.quality.helpfulness_score for c in calls if c.quality]
+        avg_helpfulness = sum(helpfulness_scores) / len(helpfulness_scores) if helpfulness_scores else 100
+
+        variant_stats.append({
+            "name": variant,
+            "description": variant_info.get(variant, {}).get("description", "No description"),
+            "call_count": call_count,
+            "booking_rate": booking_rate,
+            "avg_quality": avg_quality,
+            "avg_efficiency": avg_efficiency,
+            "avg_accuracy": avg_accuracy,
+            "avg_naturalness": avg_naturalness,
+            "avg_professionalism": avg_professionalism,
+            "avg_helpfulness": avg_helpfulness,
+            "quality_scores": quality_scores,
+            "is_winner": False,
+            "is_significant": False
+        })
+
+    return variant_stats
 
-        # Calculate stats for each variant
-        variant_stats = []
-        variant_chart_data = {
-            "labels": [],
-            "quality": [],
-            "booking_rate": []
-        }
 
-        for variant, calls in calls_by_variant.items():
-            if len(calls) == 0:
-                continue
-
-            # Calculate metrics
-            call_count = len(calls)
-            bookings = sum(1 for c in calls if c.booking_completed)
-            booking_rate = (bookings / call_count * 100) if call_count > 0 else 0
-
-            quality_scores = [c.quality.overall_score for c in calls if c.quality]
-            avg_quality = sum(quality_scores) / len(quality_scores) if quality_scores else 0
-
-            efficiency_scores = [c.quality.efficiency_score for c in calls if c.quality]
-            avg_efficiency = sum(efficiency_scores) / len(efficiency_scores) if efficiency_scores else 0
-
-            accuracy_scores = [c.quality.accuracy_score for c in calls if c.quality]
-            avg_accuracy = sum(accuracy_scores) / len(accuracy_scores) if accuracy_scores else 0
-
-            naturalness_scores = [c.quality.naturalness_score for c in calls if c.quality]
-            avg_naturalness = sum(naturalness_scores) / len(naturalness_scores) if naturalness_scores else 0
-
-            professionalism_scores = [c.quality.professionalism_score for c in calls if c.quality]
-            avg_professionalism = sum(professionalism_scores) / len(professionalism_scores) if professionalism_scores else 0
-
-            helpfulness_scores = [c.quality.helpfulness_score for c in calls if c.quality]
-            avg_helpfulness = sum(helpfulness_scores) / len(helpfulness_scores) if helpfulness_scores else 100
-
-            variant_stats.append({
-                "name": variant,
-                "description": variant_info.get(variant, {}).get("description", "No description"),
-                "call_count": call_count,
-                "booking_rate": booking_rate,
-                "avg_quality": avg_quality,
-                "avg_efficiency": avg_efficiency,
-                "avg_accuracy": avg_accuracy,
-                "avg_naturalness": avg_naturalness,
-                "avg_professionalism": avg_professionalism,
-                "avg_helpfulness": avg_helpfulness,
-                "quality_scores": quality_scores,
-                "is_winner": False,
-                "is_significant": False
+def build_ab_testing_summary(db) -> dict:
+    """
+    Per-variant stats, significance and recommendations rendered by the A/B testing page.
+    Chart series come from build_ab_testing_charts (served by the JSON API).
+    """
+    calls_by_variant = _load_calls_by_variant(db)
+    variant_stats = _ab_variant_stats(calls_by_variant)
+
+    # Sort by quality score
+    variant_stats.sort(key=lambda x: x["avg_quality"], reverse=True)
+
+    # Determine statistical significance
+    if len(variant_stats) >= 2:
+        best_variant = variant_stats[0]
+        best_scores = best_variant["quality_scores"]
+
+        for variant in variant_stats[1:]:
+            other_scores = variant["quality_scores"]
+
+            # Need at least 30 samples for reliable t-test
+            if len(best_scores) >= 30 and len(other_scores) >= 30:
+                t_stat, p_value = calculate_t_statistic(best_scores, other_scores)
+
+                # If p < 0.05, the difference is statistically significant
+                if p_value and p_value < 0.05:
+                    variant["is_significant"] = True
+
+        # Mark winner
+        if len(best_variant["quality_scores"]) >= 30:
+            best_variant["is_winner"] = True
+
+    # Determine best variant
+    best_variant_name = variant_stats[0]["name"] if variant_stats else "None"
+    best_score = variant_stats[0]["avg_quality"] if variant_stats else 0
+
+    # Generate recommendations
+    recommendations = []
+
+    if len(variant_stats) >= 2 and variant_stats[0]["call_count"] >= 30:
+        best = variant_stats[0]
+        worst = variant_stats[-1]
+
+        quality_diff = best["avg_quality"] - worst["avg_quality"]
+
+        if quality_diff > 10:
+            recommendations.append({
+                "type": "success",
+                "title": f"Winner: {best['name']}",
+                "description": f"This variant outperforms {worst['name']} by {quality_diff:.1f} points. Consider making this the default."
             })
 
-            # Add to chart data
-            variant_chart_data["labels"].append(variant)
-            variant_chart_data["quality"].append(round(avg_quality, 1))
-            variant_chart_data["booking_rate"].append(round(booking_rate, 1))
-
-        # Sort by quality score
-        variant_stats.sort(key=lambda x: x["avg_quality"], reverse=True)
-
-        # Determine statistical significance
-        if len(variant_stats) >= 2:
-            best_variant = variant_stats[0]
-            best_scores = best_variant["quality_scores"]
-
-            for variant in variant_stats[1:]:
-                other_scores = variant["quality_scores"]
-
-                # Need at least 30 samples for reliable t-test
-                if len(best_scores) >= 30 and len(other_scores) >= 30:
-                    t_stat, p_value = calculate_t_statistic(best_scores, other_scores)
-
-                    # If p < 0.05, the difference is statistically significant
-                    if p_value and p_value < 0.05:
-                        variant["is_significant"] = True
-
-            # Mark winner
-            if len(best_variant["quality_scores"]) >= 30:
-                best_variant["is_winner"] = True
-
-        # Determine best variant
-        best_variant_name = variant_stats[0]["name"] if variant_stats else "None"
-        best_score = variant_stats[0]["avg_quality"] if variant_stats else 0
-
-        # Prepare radar chart data
-        colors = [
-            ('rgba(102, 126, 234, 0.2)', '#667eea'),
-            ('rgba(72, 187, 120, 0.2)', '#48bb78'),
-            ('rgba(237, 137, 54, 0.2)', '#ed8936'),
-        ]
-
-        radar_chart_data = {"datasets": []}
-
-        for i, variant in enumerate(variant_stats):
-            color = colors[i % len(colors)]
-            radar_chart_data["datasets"].append({
-                "label": variant["name"],
-                "data": [
-                    round(variant["avg_efficiency"], 1),
-                    round(variant["avg_accuracy"], 1),
-                    round(variant["avg_helpfulness"], 1),
-                    round(variant["avg_naturalness"], 1),
-                    round(variant["avg_professionalism"], 1)
-                ],
-                "backgroundColor": color[0],
-                "borderColor": color[1]
+        if best["booking_rate"] > 95:
+            recommendations.append({
+                "type": "success",
+                "title": "High Booking Rate",
+                "description": f"{best['name']} achieves {best['booking_rate']:.0f}% booking rate. Excellent conversion!"
+            })
+
+        # Check for trade-offs
+        efficient_variant = max(variant_stats, key=lambda x: x["avg_efficiency"])
+        natural_variant = max(variant_stats, key=lambda x: x["avg_naturalness"])
+
+        if efficient_variant["name"] != natural_variant["name"]:
+            recommendations.append({
+                "type": "info",
+                "title": "Trade-off Detected",
+                "description": f"{efficient_variant['name']} is most efficient, but {natural_variant['name']} sounds most natural. Consider your priority."
             })
+    else:
+        recommendations.append({
+            "type": "warning",
+            "title": "Insufficient Data",
+            "description": "Need at least 30 calls per variant for reliable statistical analysis. Continue collecting data."
+        })
 
-        # Prepare time series data
-        time_series_data = {"labels": [], "datasets": []}
+    return {
+        "variants": list(calls_by_variant.keys()),
+        "total_calls": sum(len(calls) for calls in calls_by_variant.values()),
+        "best_variant": best_variant_name,
+        "best_score": best_score,
+        "variant_stats": variant_stats,
+        "recommendations": recommendations
+    }
 
-        from datetime import datetime, timedelta
-        end_date = datetime.utcnow()
-        start_date = end_date - timedelta(days=7)
 
-        # Generate date labels
-        current_date = start_date
-        while current_date <= end_date:
-            time_series_data["labels"].append(current_date.strftime("%m/%d"))
-            current_date += timedelta(days=1)
+def build_ab_testing_charts(db) -> dict:
+    """Chart series for the A/B testing page: variant bars, dimension radar, 7-day trend"""
+    calls_by_variant = _load_calls_by_variant(db)
+    variant_stats = _ab_variant_stats(calls_by_variant)
+    colors = AB_VARIANT_COLORS
+
+    # Variant comparison bars (in query order)
+    variant_chart_data = {
+        "labels": [variant["name"] for variant in variant_stats],
+        "quality": [round(variant["avg_quality"], 1) for variant in variant_stats],
+        "booking_rate": [round(variant["booking_rate"], 1) for variant in variant_stats]
+    }
 
-        # Calculate daily averages for each variant
-        for i, variant_name in enumerate(sorted(calls_by_variant.keys())):
-            daily_scores = []
-            current_date = start_date
+    # Radar datasets follow the page's ranking (best quality first)
+    ranked_stats = sorted(variant_stats, key=lambda x: x["avg_quality"], reverse=True)
+
+    radar_chart_data = {"datasets": []}
+
+    for i, variant in enumerate(ranked_stats):
+        color = colors[i % len(colors)]
+        radar_chart_data["datasets"].append({
+            "label": variant["name"],
+            "data": [
+                round(variant["avg_efficiency"], 1),
+                round(variant["avg_accuracy"], 1),
+                round(variant["avg_helpfulness"], 1),
+                round(variant["avg_naturalness"], 1),
+                round(variant["avg_professionalism"], 1)
+            ],
+            "backgroundColor": color[0],
+            "borderColor": color[1]
+        })
 
-            while current_date <= end_date:
-                day_start = current_date.replace(hour=0, minute=0, second=0)
-                day_end = current_date.replace(hour=23, minute=59, second=59)
+    # Prepare time series data
+    time_series_data = {"labels": [], "datasets": []}
 
-                day_calls = [c for c in calls_by_variant[variant_name]
-                             if day_start <= c.created_at <= day_end and c.quality]
+    from datetime import datetime, timedelta
+    end_date = datetime.utcnow()
+    start_date = end_date - timedelta(days=7)
 
-                if day_calls:
-                    avg_score = sum(c.quality.overall_score for c in day_calls) / len(day_calls)
-                    daily_scores.append(round(avg_score, 1))
-                else:
-                    daily_scores.append(None)
+    # Generate date labels
+    current_date = start_date
+    while current_date <= end_date:
+        time_series_data["labels"].append(current_date.strftime("%m/%d"))
+        current_date += timedelta(days=1)
 
-                current_date += timedelta(days=1)
+    # Calculate daily averages for each variant
+    for i, variant_name in enumerate(sorted(calls_by_variant.keys())):
+        daily_scores = []
+        current_date = start_date
 
-            color = colors[i % len(colors)]
-            time_series_data["datasets"].append({
-                "label": variant_name,
-                "data": daily_scores,
-                "borderColor": color[1],
-                "backgroundColor": color[0]
-            })
+        while current_date <= end_date:
+            day_start = current_date.replace(hour=0, minute=0, second=0)
+            day_end = current_date.replace(hour=23, minute=59, second=59)
 
-        # Generate recommendations
-        recommendations = []
+            day_calls = [c for c in calls_by_variant[variant_name]
+                         if day_start <= c.created_at <= day_end and c.quality]
 
-        if len(variant_stats) >= 2 and variant_stats[0]["call_count"] >= 30:
-            best = variant_stats[0]
-            worst = variant_stats[-1]
+            if day_calls:
+                avg_score = sum(c.quality.overall_score for c in day_calls) / len(day_calls)
+                daily_scores.append(round(avg_score, 1))
+            else:
+                daily_scores.append(None)
 
-            quality_diff = best["avg_quality"] - worst["avg_quality"]
+            current_date += timedelta(days=1)
 
-            if quality_diff > 10:
-                recommendations.append({
-                    "type": "success",
-                    "title": f"Winner: {best['name']}",
-                    "description": f"This variant outperforms {worst['name']} by {quality_diff:.1f} points. Consider making this the default."
-                })
+        color = colors[i % len(colors)]
+        time_series_data["datasets"].append({
+            "label": variant_name,
+            "data": daily_scores,
+            "borderColor": color[1],
+            "backgroundColor": color[0]
+        })
 
-            if best["booking_rate"] > 95:
-                recommendations.append({
-                    "type": "success",
-                    "title": "High Booking Rate",
-                    "description": f"{best['name']} achieves {best['booking_rate']:.0f}% booking rate. Excellent conversion!"
-                })
+    return {
+        "variant_chart_data": variant_chart_data,
+        "radar_chart_data": radar_chart_data,
+        "time_series_data": time_series_data
+    }
 
-            # Check for trade-offs
-            efficient_variant = max(variant_stats, key=lambda x: x["avg_efficiency"])
-            natural_variant = max(variant_stats, key=lambda x: x["avg_naturalness"])
 
-            if efficient_variant["name"] != natural_variant["name"]:
-                recommendations.append({
-                    "type": "info",
-                    "title": "Trade-off Detected",
-                    "description": f"{efficient_variant['name']} is most efficient, but {natural_variant['name']} sounds most natural. Consider your priority."
-                })
-        else:
-            recommendations.append({
-                "type": "warning",
-                "title": "Insufficient Data",
-                "description": "Need at least 30 calls per variant for reliable statistical analysis. Continue collecting data."
-            })
+@app.get("/dashboard/ab-testing", response_class=HTMLResponse)
+async def dashboard_ab_testing(request: Request):
+    """A/B testing analysis dashboard (charts load from /dashboard/api/ab-testing)"""
+    db = get_db()
+    try:
+        summary = build_ab_testing_summary(db)
 
         return templates.TemplateResponse("dashboard_ab_testing.html", {
             "request": request,
-            "variants": list(calls_by_variant.keys()),
-            "total_calls": len(all_calls),
-            "best_variant": best_variant_name,
-            "best_score": best_score,
-            "variant_stats": variant_stats,
-            "variant_chart_data": variant_chart_data,
-            "radar_chart_data": radar_chart_data,
-            "time_series_data": time_series_data,
-            "recommendations": recommendations
+            **summary
         })
     finally:
         db.close()
+
+
+@app.get("/dashboard/api/ab-testing", response_class=ORJSONResponse)
+async def api_ab_testing():
+    """JSON API for A/B testing dashboard charts"""
+    db = get_db()
+    try:
+        return ORJSONResponse(build_ab_testing_charts(db))
+    finally:
+        db.close()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
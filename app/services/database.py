@@ -3,8 +3,8 @@ Database models and setup for phone agent
 Using SQLite (easy to upgrade to PostgreSQL later)
 """
 import os
-from datetime import datetime
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Boolean, Float, Text, ForeignKey, JSON
+from datetime import date, datetime, time
+from sqlalchemy import create_engine, Column, Integer, String, Date, Time, DateTime, Boolean, Float, Text, ForeignKey, JSON, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 
@@ -12,22 +12,57 @@ from sqlalchemy.orm import sessionmaker, relationship
 Base = declarative_base()
 
 
+def parse_reservation_date(value) -> date:
+    """Parse a YYYY-MM-DD string into a date (dates pass through unchanged)"""
+    if value is None or isinstance(value, date):
+        return value
+    return date.fromisoformat(value)
+
+
+def parse_reservation_time(value) -> time:
+    """Parse an HH:MM (24-hour) string into a time (times pass through unchanged)"""
+    if value is None or isinstance(value, time):
+        return value
+    return time.fromisoformat(value)
+
+
 class Reservation(Base):
     """Restaurant reservation model"""
     __tablename__ = 'reservations'
+    __table_args__ = (
+        Index('ix_res_date_time', 'date', 'time'),  # Availability lookups by slot
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String(100), nullable=False)
     phone = Column(String(20))
     party_size = Column(Integer, nullable=False)
-    date = Column(String(20), nullable=False)  # YYYY-MM-DD format
-    time = Column(String(10), nullable=False)  # HH:MM format (24-hour)
+    reservation_date = Column('date', Date, nullable=False)
+    reservation_time = Column('time', Time, nullable=False)  # 24-hour
     status = Column(String(20), default='confirmed')  # confirmed, cancelled, completed
     assigned_table_id = Column(Integer)  # Which specific table is assigned
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     call_sid = Column(String(100))  # Twilio call ID
 
+    @property
+    def date(self) -> str:
+        """Reservation date as a YYYY-MM-DD string"""
+        return self.reservation_date.isoformat() if self.reservation_date else None
+
+    @date.setter
+    def date(self, value):
+        self.reservation_date = parse_reservation_date(value)
+
+    @property
+    def time(self) -> str:
+        """Reservation time as an HH:MM (24-hour) string"""
+        return self.reservation_time.strftime("%H:%M") if self.reservation_time else None
+
+    @time.setter
+    def time(self, value):
+        self.reservation_time = parse_reservation_time(value)
+
     def __repr__(self):
         return f"<Reservation(name={self.name}, party_size={self.party_size}, date={self.date}, time={self.time})>"
 
@@ -162,6 +197,8 @@ class CallQuality(Base):
     frustration_detected = Column(Boolean, default=False)
 
     # Analysis Metadata
+    needs_ai = Column(Boolean, default=True, index=True)  # AI dimensions still at defaults, waiting for scoring
+    transcript_hash = Column(String(64), index=True)  # SHA256 of the scored transcript - reuse AI scores for identical ones
     analyzed_at = Column(DateTime)
     analyzer_version = Column(String(10), default="v1.0")  # Track which scoring logic version
 
@@ -194,6 +231,9 @@ class ConversationTurn(Base):
     Stores the full conversation transcript
     """
     __tablename__ = "conversation_turns"
+    __table_args__ = (
+        Index('ix_turns_call_sid_turn_number', 'call_sid', 'turn_number'),  # Transcript reads: one call, in turn order
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     call_sid = Column(String(100), ForeignKey("call_metrics.call_sid"), index=True)
@@ -202,6 +242,10 @@ class ConversationTurn(Base):
     transcript = Column(Text)
     timestamp = Column(DateTime, default=datetime.utcnow)
 
+    # Keyword flags set at insert time (user turns only) so accuracy scoring is a SQL aggregate
+    has_correction = Column(Boolean, default=False)
+    has_confirmation = Column(Boolean, default=False)
+
     # Relationship
     call = relationship("CallMetrics", back_populates="turns")
 
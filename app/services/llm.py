@@ -3,13 +3,35 @@ LLM Service - Handles communication with Claude API
 Now includes tool/function calling for restaurant operations
 """
 import os
-import json
+import copy
+import hashlib
+import re
+import threading
+from functools import lru_cache
+from typing import Iterator
+import httpx
+import orjson
+from cachetools import TTLCache
 from dotenv import load_dotenv
-from anthropic import Anthropic
+from anthropic import Anthropic, DefaultHttpxClient
 
 # Load environment variables
 load_dotenv()
 
+# Live-call model - set ANTHROPIC_LIVE_MODEL to a faster model (e.g. a Haiku release) to trade
+# some quality for lower time-to-first-token. Offline quality analysis keeps its own model.
+DEFAULT_LIVE_MODEL = "claude-sonnet-4-20250514"
+
+# Output budget for live replies (room for tool_use blocks and full booking confirmations)
+LIVE_MAX_TOKENS = 1024
+
+# Response cache for repeated plain-text exchanges ("yes", "ok", greetings)
+RESPONSE_CACHE_SIZE = 2048
+RESPONSE_CACHE_TTL_SECONDS = 600
+
+# Sentence boundary for streamed text - whitespace right after . ! or ?
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+")
+
 
 class LLMService:
     """Service for interacting with Claude AI with tool support"""
@@ -20,8 +42,14 @@ class LLMService:
         if not api_key:
             raise ValueError("ANTHROPIC_API_KEY environment variable not set")
         
-        self.client = Anthropic(api_key=api_key)
-        self.model = "claude-sonnet-4-20250514"
+        # Explicit keep-alive pool so concurrent calls reuse warm connections;
+        # HTTP/2 lets several in-flight requests share one TCP+TLS connection
+        http_client = DefaultHttpxClient(
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=32, keepalive_expiry=60),
+            http2=True
+        )
+        self.client = Anthropic(api_key=api_key, http_client=http_client)
+        self.model = os.getenv("ANTHROPIC_LIVE_MODEL", DEFAULT_LIVE_MODEL)
 
         # System prompt for restaurant agent with tool usage
         self.system_prompt = """You are a friendly AI assistant for Luigi's Italian Restaurant.
@@ -64,6 +92,39 @@ Important:
 Remember: You're speaking on a phone call, not writing an email. Be concise!
 """
 
+        # System prompt as a cacheable block - it's identical on every turn of every call,
+        # so Anthropic can reuse the cached prefix instead of re-billing full input tokens
+        self.system_blocks = [{
+            "type": "text",
+            "text": self.system_prompt,
+            "cache_control": {"type": "ephemeral"}
+        }]
+
+        # Identical (system prompt, tools, messages) -> identical reply, so skip the round-trip
+        self._response_cache = TTLCache(maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL_SECONDS)
+        self._response_cache_lock = threading.Lock()
+
+    def _response_cache_key(self, messages: list, tools: list):
+        """
+        Hash of everything Claude sees, or None if the exchange shouldn't be cached.
+        Turns carrying tool_use/tool_result blocks depend on live reservation data, so they're skipped.
+        """
+        if any(not isinstance(message["content"], str) for message in messages):
+            return None
+
+        payload = orjson.dumps(
+            {"s": self.system_prompt, "m": messages, "t": tools or []},
+            option=orjson.OPT_SORT_KEYS
+        )
+        return hashlib.sha256(payload).digest()
+
+    @staticmethod
+    def _with_cached_tools(tools: list) -> list:
+        """Copy of tools with a cache breakpoint on the last definition (tools are static too)"""
+        if not tools:
+            return []
+        return tools[:-1] + [{**tools[-1], "cache_control": {"type": "ephemeral"}}]
+
     def get_response_with_tools(
             self,
             user_message: str,
@@ -87,50 +148,135 @@ Remember: You're speaking on a phone call, not writing an email. Be concise!
             "role": "user",
             "content": user_message
         })
-        
+
+        cache_key = self._response_cache_key(messages, tools)
+        if cache_key is not None:
+            with self._response_cache_lock:
+                cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                # Callers append these content blocks to their history, so hand out a copy
+                return copy.deepcopy(cached)
+
         try:
             # Call Claude API with tools
             response = self.client.messages.create(
                 model=self.model,
-                max_tokens=1024,
-                system=self.system_prompt,
+                max_tokens=LIVE_MAX_TOKENS,
+                system=self.system_blocks,
                 messages=messages,
-                tools=tools or []
+                tools=self._with_cached_tools(tools)
             )
 
-            # Extract response
-            result = {
-                "stop_reason": response.stop_reason,
-                "content": []
-            }
-
-            # Process content blocks
-            for block in response.content:
-                if block.type == "text":
-                    result["content"].append({
-                        "type": "text",
-                        "text": block.text
-                    })
-                elif block.type == "tool_use":
-                    result["content"].append({
-                        "type": "tool_use",
-                        "id": block.id,
-                        "name": block.name,
-                        "input": block.input
-                    })
+            result = self._to_result(response)
+
+            # Never cache a reply that was cut off at the token limit
+            if cache_key is not None and response.stop_reason != "max_tokens":
+                with self._response_cache_lock:
+                    self._response_cache[cache_key] = copy.deepcopy(result)
 
             return result
 
         except Exception as e:
             print(f"Error calling Claude API: {e}")
-            return {
-                "stop_reason": "error",
-                "content": [{
+            return self._error_result()
+
+    def stream_response_with_tools(
+            self,
+            user_message: str,
+            conversation_history: list = None,
+            tools: list = None
+    ) -> Iterator[dict]:
+        """
+        Streaming version of get_response_with_tools.
+        Lets a TTS layer start speaking the first sentence while Claude is still writing.
+
+        Args:
+            user_message: What the user just said
+            conversation_history: List of previous messages
+            tools: List of tool definitions (function calling schema)
+
+        Yields:
+            {"type": "text", "text": sentence} as each sentence completes, then
+            {"type": "final", "result": ...} with the same dict get_response_with_tools returns
+            (tool_use blocks only arrive here, once the full message is in)
+        """
+        # Build messages list
+        messages = conversation_history or []
+        messages.append({
+            "role": "user",
+            "content": user_message
+        })
+
+        try:
+            with self.client.messages.stream(
+                model=self.model,
+                max_tokens=LIVE_MAX_TOKENS,
+                system=self.system_blocks,
+                messages=messages,
+                tools=self._with_cached_tools(tools)
+            ) as stream:
+                pending = ""
+                for text in stream.text_stream:
+                    pending += text
+                    *sentences, pending = _SENTENCE_BREAK.split(pending)
+                    for sentence in sentences:
+                        yield {"type": "text", "text": sentence}
+
+                if pending.strip():
+                    yield {"type": "text", "text": pending.strip()}
+
+                response = stream.get_final_message()
+
+            yield {"type": "final", "result": self._to_result(response)}
+
+        except Exception as e:
+            print(f"Error streaming from Claude API: {e}")
+            yield {"type": "final", "result": self._error_result()}
+
+    @staticmethod
+    def _to_result(response) -> dict:
+        """Convert a Claude message into the plain dict main.py works with"""
+        result = {
+            "stop_reason": response.stop_reason,
+            "content": []
+        }
+
+        # Process content blocks
+        for block in response.content:
+            if block.type == "text":
+                result["content"].append({
                     "type": "text",
-                    "text": "I'm sorry, I'm having trouble right now. Could you repeat that?"
-                }]
-            }
+                    "text": block.text
+                })
+            elif block.type == "tool_use":
+                result["content"].append({
+                    "type": "tool_use",
+                    "id": block.id,
+                    "name": block.name,
+                    "input": block.input
+                })
+
+        return result
+
+    @staticmethod
+    def _error_result() -> dict:
+        """Spoken fallback when Claude can't be reached"""
+        return {
+            "stop_reason": "error",
+            "content": [{
+                "type": "text",
+                "text": "I'm sorry, I'm having trouble right now. Could you repeat that?"
+            }]
+        }
+
+
+@lru_cache(maxsize=1)
+def get_llm_service() -> LLMService:
+    """
+    Get the shared LLMService instance.
 
+    Built lazily on first use so importing this module doesn't read env vars
+    or construct the Anthropic HTTP client before the event loop starts.
+    """
+    return LLMService()
 
-# Create a singleton instance
-llm_service = LLMService()
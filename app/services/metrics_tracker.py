@@ -2,10 +2,23 @@
 Metrics Tracker - Track call metrics during phone conversations
 Integrates with main.py to collect quality metrics in real-time
 """
+import asyncio
+import re
+import threading
+import time
 from datetime import datetime
 from typing import Dict, List, Optional
 from app.services.database import get_db, CallMetrics, ConversationTurn
-from app.services.quality_analyzer import analyze_call_quality
+from app.services.quality_analyzer import classify_user_turn
+
+
+# Phrases that mean the caller needed the agent to repeat itself.
+# Plain substring match, compiled into one alternation so each turn is scanned once.
+CLARIFICATION_PHRASES = [
+    "sorry", "pardon", "what", "repeat", "didn't catch",
+    "can you say", "speak up", "come again"
+]
+_CLARIFICATION_RE = re.compile("|".join(map(re.escape, CLARIFICATION_PHRASES)))
 
 
 class CallMetricsTracker:
@@ -19,12 +32,13 @@ class CallMetricsTracker:
         self.caller_phone = caller_phone
         self.call_start = datetime.utcnow()
         self.call_end = None
+        self._t0 = time.monotonic()  # Durations use the monotonic clock (immune to wall-clock jumps)
 
         # Conversation tracking
         self.user_turns = 0
         self.agent_turns = 0
         self.clarifications_needed = 0
-        self.conversation_turns = []  # List of (speaker, text, timestamp)
+        self.conversation_turns = []  # List of (speaker, text, timestamp, has_correction, has_confirmation)
 
         # Outcomes
         self.booking_completed = False
@@ -43,21 +57,21 @@ class CallMetricsTracker:
         """Record a user message"""
         self.user_turns += 1
         timestamp = datetime.utcnow()
-        self.conversation_turns.append(("user", text, timestamp))
+        lowered = text.lower()
+
+        # Flag correction/confirmation keywords now so accuracy scoring doesn't rescan the transcript
+        has_correction, has_confirmation = classify_user_turn(lowered)
+        self.conversation_turns.append(("user", text, timestamp, has_correction, has_confirmation))
 
         # Detect clarification requests
-        clarification_phrases = [
-            "sorry", "pardon", "what", "repeat", "didn't catch",
-            "can you say", "speak up", "come again"
-        ]
-        if any(phrase in text.lower() for phrase in clarification_phrases):
+        if _CLARIFICATION_RE.search(lowered):
             self.clarifications_needed += 1
 
     def add_agent_turn(self, text: str):
         """Record an agent message"""
         self.agent_turns += 1
         timestamp = datetime.utcnow()
-        self.conversation_turns.append(("agent", text, timestamp))
+        self.conversation_turns.append(("agent", text, timestamp, False, False))
 
     def add_tool_call(self, tool_name: str, latency_ms: float = 0):
         """Record a tool being called"""
@@ -81,7 +95,7 @@ class CallMetricsTracker:
     def finalize_call(self) -> str:
         """
         Call this when the phone call ends.
-        Saves all metrics to database and triggers quality analysis.
+        Saves all metrics to database (quality analysis runs in the background worker).
 
         Returns:
             call_sid
@@ -91,7 +105,7 @@ class CallMetricsTracker:
         db = get_db()
         try:
             # Calculate duration
-            duration = (self.call_end - self.call_start).total_seconds()
+            duration = time.monotonic() - self._t0
 
             # Save CallMetrics
             metrics = CallMetrics(
@@ -112,30 +126,28 @@ class CallMetricsTracker:
                 caller_phone=self.caller_phone
             )
             db.add(metrics)
+            db.flush()  # Parent row first - bulk saves bypass the unit of work ordering
 
-            # Save ConversationTurns
-            for turn_num, (speaker, text, timestamp) in enumerate(self.conversation_turns, 1):
-                turn = ConversationTurn(
+            # Save ConversationTurns as one multi-row INSERT
+            turns = [
+                ConversationTurn(
                     call_sid=self.call_sid,
                     turn_number=turn_num,
                     speaker=speaker,
                     transcript=text,
-                    timestamp=timestamp
+                    timestamp=timestamp,
+                    has_correction=has_correction,
+                    has_confirmation=has_confirmation
                 )
-                db.add(turn)
+                for turn_num, (speaker, text, timestamp, has_correction, has_confirmation) in enumerate(self.conversation_turns, 1)
+            ]
+            db.bulk_save_objects(turns)
 
             db.commit()
 
             print(f"✅ Saved metrics for call {self.call_sid}")
             print(f"   Duration: {duration:.1f}s, Turns: {self.user_turns}, Booking: {self.booking_completed}")
 
-            # Run quick quality analysis (algorithm-based, no AI)
-            try:
-                result = analyze_call_quality(self.call_sid, use_ai=False)
-                print(f"   Quality: {result['overall_score']:.1f}/100 ({result['quality_tier']})")
-            except Exception as e:
-                print(f"   ⚠️  Quality analysis will run later: {e}")
-
             return self.call_sid
 
         except Exception as e:
@@ -145,11 +157,18 @@ class CallMetricsTracker:
         finally:
             db.close()
 
+    async def finalize_call_async(self) -> str:
+        """
+        finalize_call without blocking the event loop.
+        The DB writes run in a worker thread so webhooks can respond right away.
+        """
+        return await asyncio.to_thread(self.finalize_call)
+
     def to_dict(self) -> Dict:
         """Get current metrics as dict (for debugging)"""
         return {
             "call_sid": self.call_sid,
-            "duration_so_far": (datetime.utcnow() - self.call_start).total_seconds(),
+            "duration_so_far": time.monotonic() - self._t0,
             "user_turns": self.user_turns,
             "agent_turns": self.agent_turns,
             "clarifications_needed": self.clarifications_needed,
@@ -161,8 +180,45 @@ class CallMetricsTracker:
 
 # ==================== GLOBAL TRACKER STORAGE ====================
 
+class TrackerRegistry:
+    """
+    In-memory store of active call trackers, split into lock-protected shards.
+    Concurrent Twilio callbacks (and finalize_call in worker threads) only contend
+    when their calls land on the same shard.
+    Per-process: with several uvicorn workers each one tracks the calls it served.
+    """
+
+    SHARD_COUNT = 16  # Power of two, so the shard is a bit mask of the hash
+
+    def __init__(self):
+        self._shards: List[Dict[str, CallMetricsTracker]] = [{} for _ in range(self.SHARD_COUNT)]
+        self._locks = [threading.Lock() for _ in range(self.SHARD_COUNT)]
+
+    def _shard_index(self, call_sid: str) -> int:
+        return hash(call_sid) & (self.SHARD_COUNT - 1)
+
+    def add(self, call_sid: str, tracker: CallMetricsTracker):
+        i = self._shard_index(call_sid)
+        with self._locks[i]:
+            self._shards[i][call_sid] = tracker
+
+    def get(self, call_sid: str) -> Optional[CallMetricsTracker]:
+        i = self._shard_index(call_sid)
+        with self._locks[i]:
+            return self._shards[i].get(call_sid)
+
+    def pop(self, call_sid: str) -> Optional[CallMetricsTracker]:
+        """Remove and return the tracker (None if missing) - only one caller ever gets it"""
+        i = self._shard_index(call_sid)
+        with self._locks[i]:
+            return self._shards[i].pop(call_sid, None)
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+
 # Store active call trackers (in-memory for current calls)
-active_trackers: Dict[str, CallMetricsTracker] = {}
+active_trackers = TrackerRegistry()
 
 
 def start_tracking_call(call_sid: str, caller_phone: str = None) -> CallMetricsTracker:
@@ -171,7 +227,7 @@ def start_tracking_call(call_sid: str, caller_phone: str = None) -> CallMetricsT
     Call this at the beginning of a phone conversation.
     """
     tracker = CallMetricsTracker(call_sid, caller_phone)
-    active_trackers[call_sid] = tracker
+    active_trackers.add(call_sid, tracker)
     print(f"📊 Started tracking call: {call_sid}")
     return tracker
 
@@ -181,20 +237,39 @@ def get_tracker(call_sid: str) -> Optional[CallMetricsTracker]:
     return active_trackers.get(call_sid)
 
 
-def end_tracking_call(call_sid: str) -> str:
+def end_tracking_call(call_sid: str) -> Optional[str]:
     """
     End tracking and save metrics.
     Call this when the phone call ends.
+
+    Returns:
+        call_sid if metrics were saved, None if the call wasn't being tracked
     """
-    tracker = active_trackers.get(call_sid)
+    # Remove from active trackers first, so concurrent callers can't save it twice
+    tracker = active_trackers.pop(call_sid)
     if not tracker:
         print(f"⚠️  No tracker found for call {call_sid}")
-        return call_sid
+        return None
 
     # Finalize and save
     tracker.finalize_call()
 
-    # Remove from active trackers
-    del active_trackers[call_sid]
+    return call_sid
+
+
+async def end_tracking_call_async(call_sid: str) -> Optional[str]:
+    """
+    Async version of end_tracking_call - saves metrics off the event loop.
+    The tracker is removed first, so a repeated end-of-call webhook can't save it twice.
+
+    Returns:
+        call_sid if metrics were saved, None if the call wasn't being tracked
+    """
+    tracker = active_trackers.pop(call_sid)
+    if not tracker:
+        print(f"⚠️  No tracker found for call {call_sid}")
+        return None
+
+    await tracker.finalize_call_async()
 
     return call_sid
@@ -8,13 +8,20 @@ This module implements the 5-dimensional quality scoring system:
 4. Naturalness (AI-based)
 5. Professionalism (AI-based)
 """
-import json
+import asyncio
+import bisect
+import hashlib
 import os
+import re
 from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import anthropic
+import httpx
+import orjson
+from sqlalchemy import exists
 
 from app.services.database import get_db, CallMetrics, CallQuality, ConversationTurn
+from app.services.quality_cache import get_cached_quality, cache_quality, invalidate_quality
 
 
 # ==================== DIMENSION 1: EFFICIENCY (100% Algorithm) ====================
@@ -53,63 +60,70 @@ def calculate_efficiency_score(metrics: CallMetrics) -> float:
 
 # ==================== DIMENSION 2: ACCURACY (90% Algorithm) ====================
 
-def calculate_accuracy_score(call_sid: str) -> float:
+# User phrases that signal the agent got something wrong
+CORRECTION_KEYWORDS = [
+    "no", "actually", "i said", "that's wrong",
+    "you mean", "not", "correction", "mistake",
+    "i meant", "that's not right"
+]
+
+# User phrases that confirm the agent got it right
+CONFIRMATION_KEYWORDS = [
+    "yes that's right", "correct", "exactly",
+    "yes", "perfect", "that's it"
+]
+
+
+def _compile_keywords(keywords: List[str]) -> re.Pattern:
+    """One whole-word alternation regex, so each turn is scanned once per keyword list"""
+    return re.compile(r"\b(?:" + "|".join(map(re.escape, keywords)) + r")\b", re.IGNORECASE)
+
+
+_CORRECTION_RE = _compile_keywords(CORRECTION_KEYWORDS)
+_CONFIRMATION_RE = _compile_keywords(CONFIRMATION_KEYWORDS)
+
+
+def classify_user_turn(text: str) -> Tuple[bool, bool]:
+    """
+    Flag a user turn for accuracy scoring.
+    Run once when the turn is recorded; the flags are stored on ConversationTurn.
+
+    Returns:
+        (has_correction, has_confirmation)
+    """
+    return bool(_CORRECTION_RE.search(text)), bool(_CONFIRMATION_RE.search(text))
+
+
+def calculate_accuracy_score(turns: List[ConversationTurn]) -> float:
     """
     Calculate accuracy score by counting corrections and errors.
-    Algorithm-based analysis of transcript.
+    Counts the keyword flags stored on each user turn (see classify_user_turn).
+
+    Args:
+        turns: The call's ConversationTurns (already loaded by analyze_call_quality)
     """
-    db = get_db()
-    try:
-        # Get conversation turns
-        turns = db.query(ConversationTurn).filter(
-            ConversationTurn.call_sid == call_sid,
-            ConversationTurn.speaker == "user"
-        ).all()
-
-        if not turns:
-            return 75.0  # Default if no transcript
-
-        score = 100.0
-
-        # Count correction keywords in user messages
-        correction_keywords = [
-            "no", "actually", "i said", "that's wrong",
-            "you mean", "not", "correction", "mistake",
-            "i meant", "that's not right"
-        ]
-
-        corrections = 0
-        for turn in turns:
-            text = turn.transcript.lower()
-            for keyword in correction_keywords:
-                if keyword in text:
-                    corrections += 1
-                    break  # Only count once per turn
-
-        # Penalty for corrections (-15 points each)
-        score -= corrections * 15
-
-        # Check for confirmations (bonus points)
-        confirmation_keywords = [
-            "yes that's right", "correct", "exactly",
-            "yes", "perfect", "that's it"
-        ]
-
-        confirmations = 0
-        for turn in turns:
-            text = turn.transcript.lower()
-            for keyword in confirmation_keywords:
-                if keyword in text:
-                    confirmations += 1
-                    break
-
-        # Bonus for confirmations (up to +20)
-        score += min(confirmations * 5, 20)
-
-        return max(0.0, min(100.0, score))
+    # One pass over the turns for all three counts
+    user_turns = corrections = confirmations = 0
+    for turn in turns:
+        if turn.speaker == "user":
+            user_turns += 1
+            if turn.has_correction:
+                corrections += 1
+            if turn.has_confirmation:
+                confirmations += 1
+
+    if not user_turns:
+        return 75.0  # Default if no transcript
 
-    finally:
-        db.close()
+    score = 100.0
+
+    # Penalty for corrections (-15 points each)
+    score -= corrections * 15
+
+    # Bonus for confirmations (up to +20)
+    score += min(confirmations * 5, 20)
+
+    return max(0.0, min(100.0, score))
 
 
 # ==================== DIMENSION 3: HELPFULNESS (100% Algorithm) ====================
@@ -139,112 +153,148 @@ def calculate_helpfulness_score(metrics: CallMetrics) -> float:
     return 50.0
 
 
-# ==================== DIMENSION 4: NATURALNESS (100% AI) ====================
+# ==================== DIMENSIONS 4 & 5: NATURALNESS + PROFESSIONALISM (100% AI) ====================
 
-def calculate_naturalness_score(call_sid: str) -> float:
+def _load_turns(db, call_sid: str) -> List[ConversationTurn]:
     """
-    Calculate naturalness score using Claude AI.
-    Analyzes conversation flow and human-likeness.
+    Fetch a call's conversation turns in order.
+    Only the columns the scorers read (plain rows, not full ORM objects) - loaded once
+    per analysis and shared by accuracy scoring and the AI transcript.
     """
-    db = get_db()
-    try:
-        # Get full transcript
-        turns = db.query(ConversationTurn).filter(
-            ConversationTurn.call_sid == call_sid
-        ).order_by(ConversationTurn.turn_number).all()
+    return db.query(
+        ConversationTurn.speaker,
+        ConversationTurn.transcript,
+        ConversationTurn.has_correction,
+        ConversationTurn.has_confirmation
+    ).filter(
+        ConversationTurn.call_sid == call_sid
+    ).order_by(ConversationTurn.turn_number).all()
 
-        if not turns:
-            return 75.0  # Default if no transcript
 
-        # Build conversation text
-        transcript = "\n".join([
-            f"{turn.speaker.capitalize()}: {turn.transcript}"
-            for turn in turns
-        ])
+def _format_transcript(turns: List[ConversationTurn]) -> str:
+    """Build the full "Speaker: text" transcript ("" if no turns)"""
+    return "\n".join([
+        f"{turn.speaker.capitalize()}: {turn.transcript}"
+        for turn in turns
+    ])
 
-        # Call Claude API for analysis
-        api_key = os.getenv("ANTHROPIC_API_KEY")
-        if not api_key:
-            print("⚠️  No ANTHROPIC_API_KEY - using default naturalness score")
-            return 75.0
 
-        client = anthropic.Anthropic(api_key=api_key)
+# Turns kept from the start and end of long calls when building the AI scoring prompt.
+# The greeting and the wrap-up carry most of the tone signal; input tokens stay bounded.
+TRANSCRIPT_HEAD_TURNS = 5
+TRANSCRIPT_TAIL_TURNS = 10
 
-        prompt = f"""You are a conversation quality expert analyzing phone calls.
 
-Rate this conversation for NATURALNESS (0-100):
+def _sampled_transcript(
+    turns: List[ConversationTurn],
+    head: int = TRANSCRIPT_HEAD_TURNS,
+    tail: int = TRANSCRIPT_TAIL_TURNS
+) -> str:
+    """Transcript of the first `head` and last `tail` turns, with a marker where turns were skipped"""
+    if len(turns) <= head + tail:
+        return _format_transcript(turns)
 
-{transcript}
+    skipped = len(turns) - head - tail
+    return "\n".join([
+        _format_transcript(turns[:head]),
+        f"[... {skipped} turns omitted ...]",
+        _format_transcript(turns[-tail:])
+    ])
 
-Criteria:
-1. Greeting appropriateness (5-20 words, friendly not overly formal)
-2. Natural language (sounds human, not robotic or scripted)
-3. Smooth topic transitions (not abrupt)
-4. Appropriate pacing (not too fast or slow)
-5. Natural acknowledgments (uses "great", "perfect", etc naturally)
 
-Return ONLY a JSON object with this exact format:
-{{"score": 85, "reasoning": "brief explanation"}}"""
+def _load_transcript(db, call_sid: str) -> str:
+    """Build the (sampled) transcript for AI scoring of a call ("" if no turns)"""
+    return _sampled_transcript(_load_turns(db, call_sid))
 
-        response = client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=200,
-            messages=[{"role": "user", "content": prompt}]
-        )
 
-        # Parse JSON response
-        result_text = response.content[0].text
-        # Remove markdown code blocks if present
-        result_text = result_text.replace("```json", "").replace("```", "").strip()
-        result = json.loads(result_text)
+# Calls below these have nothing for Claude to judge - they keep the 75.0 AI defaults
+MIN_AI_DURATION_SEC = 30
+MIN_AI_USER_TURNS = 2
+MIN_AI_TRANSCRIPT_CHARS = 80
 
-        return float(result.get("score", 75.0))
 
-    except Exception as e:
-        print(f"⚠️  Error calculating naturalness: {e}")
-        return 75.0  # Default on error
-    finally:
-        db.close()
+def _skip_ai_scoring(metrics: CallMetrics, transcript: str) -> bool:
+    """True for hang-ups and very short calls, where AI scoring would just burn API calls"""
+    return (
+        metrics.user_hung_up_early
+        or (metrics.total_duration_sec or 0) < MIN_AI_DURATION_SEC
+        or (metrics.user_turns or 0) < MIN_AI_USER_TURNS
+        or len(transcript) < MIN_AI_TRANSCRIPT_CHARS
+    )
+
 
+def _transcript_hash(transcript: str) -> str:
+    """SHA256 hex digest identifying a transcript"""
+    return hashlib.sha256(transcript.encode()).hexdigest()
 
-# ==================== DIMENSION 5: PROFESSIONALISM (100% AI) ====================
 
-def calculate_professionalism_score(call_sid: str) -> float:
+def _cached_ai_scores(db, transcript_hashes: List[str]) -> Dict[str, Tuple[float, float]]:
     """
-    Calculate professionalism score using Claude AI.
-    Analyzes tone and appropriateness.
+    AI scores already computed for any of these transcripts (e.g. replays, retried analyses).
+
+    Returns:
+        Dict of transcript_hash -> (naturalness, professionalism)
     """
-    db = get_db()
-    try:
-        # Get full transcript
-        turns = db.query(ConversationTurn).filter(
-            ConversationTurn.call_sid == call_sid
-        ).order_by(ConversationTurn.turn_number).all()
+    rows = db.query(
+        CallQuality.transcript_hash,
+        CallQuality.naturalness_score,
+        CallQuality.professionalism_score
+    ).filter(
+        CallQuality.transcript_hash.in_(set(transcript_hashes)),
+        CallQuality.needs_ai == False  # Only real AI scores
+    ).all()
+
+    return {row.transcript_hash: (row.naturalness_score, row.professionalism_score) for row in rows}
 
-        if not turns:
-            return 75.0  # Default if no transcript
 
-        # Build conversation text
-        transcript = "\n".join([
-            f"{turn.speaker.capitalize()}: {turn.transcript}"
-            for turn in turns
-        ])
+# Model and output budget for the fused naturalness + professionalism prompt
+_AI_SCORING_MODEL = "claude-sonnet-4-20250514"
+_AI_SCORING_MAX_TOKENS = 400
 
-        # Call Claude API for analysis
+# How often to check whether a submitted Message Batch has finished
+BATCH_POLL_SECONDS = 30
+
+# Shared Claude client - created on first use so its connection pool is reused across calls
+_client: Optional[anthropic.AsyncAnthropic] = None
+
+# Room for a full analyze_pending_calls batch in flight without evicting warm connections
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=32, keepalive_expiry=60)
+
+
+def _get_client() -> Optional[anthropic.AsyncAnthropic]:
+    """
+    Get the shared Anthropic client (None if ANTHROPIC_API_KEY isn't set).
+    Keeps warm connections instead of a fresh pool + TLS handshake per analysis.
+    """
+    global _client
+    if _client is None:
         api_key = os.getenv("ANTHROPIC_API_KEY")
         if not api_key:
-            print("⚠️  No ANTHROPIC_API_KEY - using default professionalism score")
-            return 75.0
+            print("⚠️  No ANTHROPIC_API_KEY - using default AI scores")
+            return None
+        _client = anthropic.AsyncAnthropic(
+            api_key=api_key,
+            http_client=anthropic.DefaultAsyncHttpxClient(limits=_HTTP_LIMITS, http2=True)
+        )
+    return _client
 
-        client = anthropic.Anthropic(api_key=api_key)
 
-        prompt = f"""You are a conversation quality expert analyzing phone calls.
+def build_ai_scores_prompt(transcript: str) -> str:
+    """Prompt asking Claude to rate naturalness and professionalism in one pass"""
+    return f"""You are a conversation quality expert analyzing phone calls.
 
-Rate this conversation for PROFESSIONALISM (0-100):
+Rate this conversation for NATURALNESS (0-100) and PROFESSIONALISM (0-100):
 
 {transcript}
 
-Criteria:
+NATURALNESS criteria:
+1. Greeting appropriateness (5-20 words, friendly not overly formal)
+2. Natural language (sounds human, not robotic or scripted)
+3. Smooth topic transitions (not abrupt)
+4. Appropriate pacing (not too fast or slow)
+5. Natural acknowledgments (uses "great", "perfect", etc naturally)
+
+PROFESSIONALISM criteria:
 1. Courteous language (uses "please", "thank you", not demanding)
 2. Appropriate formality (not too casual, not too stiff)
 3. Clear communication (complete sentences, good grammar)
@@ -252,31 +302,172 @@ Criteria:
 5. No slang or inappropriate language
 
 Return ONLY a JSON object with this exact format:
-{{"score": 90, "reasoning": "brief explanation"}}"""
+{{"naturalness": {{"score": 85, "reasoning": "brief explanation"}}, "professionalism": {{"score": 90, "reasoning": "brief explanation"}}}}"""
+
+
+def _parse_ai_scores(result_text: str) -> Tuple[float, float]:
+    """Parse Claude's combined JSON reply into (naturalness, professionalism)"""
+    # Remove markdown code blocks if present
+    result_text = result_text.replace("```json", "").replace("```", "").strip()
+    result = orjson.loads(result_text)
+
+    naturalness = float(result.get("naturalness", {}).get("score", 75.0))
+    professionalism = float(result.get("professionalism", {}).get("score", 75.0))
+    return naturalness, professionalism
+
+
+async def _try_score_ai_dimensions(transcript: str) -> Optional[Tuple[float, float]]:
+    """
+    Score naturalness and professionalism with a single Claude request.
+    An empty transcript gets the 75.0 defaults (nothing to score).
+
+    Returns:
+        Tuple of (naturalness, professionalism), or None if there's no API key or the call fails
+    """
+    if not transcript:
+        return 75.0, 75.0  # Default if no transcript
+
+    client = _get_client()
+    if not client:
+        return None
 
-        response = client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=200,
-            messages=[{"role": "user", "content": prompt}]
+    try:
+        response = await client.messages.create(
+            model=_AI_SCORING_MODEL,
+            max_tokens=_AI_SCORING_MAX_TOKENS,
+            messages=[{"role": "user", "content": build_ai_scores_prompt(transcript)}]
         )
 
-        # Parse JSON response
-        result_text = response.content[0].text
-        # Remove markdown code blocks if present
-        result_text = result_text.replace("```json", "").replace("```", "").strip()
-        result = json.loads(result_text)
+        return _parse_ai_scores(response.content[0].text)
+
+    except Exception as e:
+        print(f"⚠️  Error calculating AI scores: {e}")
+        return None
+
+
+async def score_ai_dimensions(transcript: str) -> Tuple[float, float]:
+    """
+    Score naturalness and professionalism with a single Claude request.
+    Falls back to 75.0 defaults if there's no transcript, no API key, or the call fails.
+
+    Returns:
+        Tuple of (naturalness, professionalism)
+    """
+    return await _try_score_ai_dimensions(transcript) or (75.0, 75.0)
+
+
+async def score_ai_dimensions_batch(transcripts: Dict[str, str]) -> Dict[str, Tuple[float, float]]:
+    """
+    Score many calls with one Message Batch (half the per-token cost of individual requests).
+    Only for offline analysis - results can take minutes to come back.
+    Calls with no transcript get the 75.0 defaults.
+
+    Args:
+        transcripts: Dict of call_sid -> transcript
 
-        return float(result.get("score", 75.0))
+    Returns:
+        Dict of call_sid -> (naturalness, professionalism); calls whose request failed are left out
+    """
+    scores = {call_sid: (75.0, 75.0) for call_sid, transcript in transcripts.items() if not transcript}
+
+    requests = [
+        {
+            "custom_id": call_sid,
+            "params": {
+                "model": _AI_SCORING_MODEL,
+                "max_tokens": _AI_SCORING_MAX_TOKENS,
+                "messages": [{"role": "user", "content": build_ai_scores_prompt(transcript)}]
+            }
+        }
+        for call_sid, transcript in transcripts.items() if transcript
+    ]
+    if not requests:
+        return scores
+
+    client = _get_client()
+    if not client:
+        return scores
+
+    try:
+        batch = await client.messages.batches.create(requests=requests)
+        print(f"📦 Submitted batch {batch.id} ({len(requests)} calls)")
+
+        while batch.processing_status != "ended":
+            await asyncio.sleep(BATCH_POLL_SECONDS)
+            batch = await client.messages.batches.retrieve(batch.id)
+
+        async for entry in await client.messages.batches.results(batch.id):
+            if entry.result.type != "succeeded":
+                print(f"⚠️  AI scoring for {entry.custom_id} {entry.result.type}")
+                continue
+            try:
+                scores[entry.custom_id] = _parse_ai_scores(entry.result.message.content[0].text)
+            except Exception as e:
+                print(f"⚠️  Error parsing AI scores for {entry.custom_id}: {e}")
 
     except Exception as e:
-        print(f"⚠️  Error calculating professionalism: {e}")
-        return 75.0  # Default on error
+        print(f"⚠️  Error running AI scoring batch: {e}")
+
+    return scores
+
+
+async def calculate_ai_scores(call_sid: str) -> Tuple[float, float]:
+    """
+    Calculate naturalness and professionalism scores for a call using Claude AI.
+
+    Returns:
+        Tuple of (naturalness, professionalism)
+    """
+    db = get_db()
+    try:
+        transcript = _load_transcript(db, call_sid)
     finally:
         db.close()
 
+    return await score_ai_dimensions(transcript)
+
+
+async def calculate_naturalness_score(transcript: str) -> float:
+    """
+    Calculate naturalness score for a transcript using Claude AI.
+    Kept for back-compat - prefer score_ai_dimensions, which returns both AI scores.
+    """
+    naturalness, _ = await score_ai_dimensions(transcript)
+    return naturalness
+
+
+async def calculate_professionalism_score(transcript: str) -> float:
+    """
+    Calculate professionalism score for a transcript using Claude AI.
+    Kept for back-compat - prefer score_ai_dimensions, which returns both AI scores.
+    """
+    _, professionalism = await score_ai_dimensions(transcript)
+    return professionalism
+
 
 # ==================== OVERALL SCORE (Weighted Composite) ====================
 
+# Tier boundaries (lower bound inclusive) and the tier for each band between them
+_TIER_EDGES = [40, 60, 75, 90]
+_TIER_NAMES = [
+    "Poor",       # 🔴 Critical issue
+    "Fair",       # ⚠️  Needs improvement
+    "Good",       # 👍 Acceptable
+    "Great",      # ✅ Target quality
+    "Excellent",  # 🌟 Reference quality
+]
+
+# Dimension weights (must sum to 1.0), as parallel tuples so scoring is one zip + sum
+_DIM_ORDER = ("accuracy", "helpfulness", "efficiency", "naturalness", "professionalism")
+_WEIGHTS = (
+    0.30,  # accuracy - Most important (getting details right)
+    0.25,  # helpfulness - Very important (solving problem)
+    0.20,  # efficiency - Nice to have (being fast)
+    0.15,  # naturalness - UX polish (sounding human)
+    0.10,  # professionalism - Baseline expected (being polite)
+)
+
+
 def calculate_overall_score(dimensions: Dict[str, float]) -> Tuple[float, str]:
     """
     Calculate overall quality score and tier.
@@ -287,45 +478,28 @@ def calculate_overall_score(dimensions: Dict[str, float]) -> Tuple[float, str]:
     Returns:
         Tuple of (overall_score, quality_tier)
     """
-    # Weights (must sum to 1.0)
-    weights = {
-        "accuracy": 0.30,       # 30% - Most important (getting details right)
-        "helpfulness": 0.25,    # 25% - Very important (solving problem)
-        "efficiency": 0.20,     # 20% - Nice to have (being fast)
-        "naturalness": 0.15,    # 15% - UX polish (sounding human)
-        "professionalism": 0.10 # 10% - Baseline expected (being polite)
-    }
-
     # Calculate weighted sum
-    overall = sum(dimensions[k] * weights[k] for k in weights)
+    overall = sum(dimensions[k] * w for k, w in zip(_DIM_ORDER, _WEIGHTS))
 
     # Determine quality tier
-    if overall >= 90:
-        tier = "Excellent"  # 🌟 Reference quality
-    elif overall >= 75:
-        tier = "Great"      # ✅ Target quality
-    elif overall >= 60:
-        tier = "Good"       # 👍 Acceptable
-    elif overall >= 40:
-        tier = "Fair"       # ⚠️  Needs improvement
-    else:
-        tier = "Poor"       # 🔴 Critical issue
+    tier = _TIER_NAMES[bisect.bisect_right(_TIER_EDGES, overall)]
 
     return overall, tier
 
 
 # ==================== MAIN ANALYZER FUNCTION ====================
 
-def analyze_call_quality(call_sid: str, use_ai: bool = True) -> Dict:
+def _score_call(
+    call_sid: str,
+    use_ai: bool,
+    ai_scores: Optional[Tuple[float, float]]
+) -> Tuple[float, float, float, str, Optional[str], Optional[Tuple[float, float]]]:
     """
-    Analyze call quality across all 5 dimensions.
-
-    Args:
-        call_sid: Twilio call SID
-        use_ai: Whether to use AI for naturalness/professionalism (default True)
+    Blocking DB half of the analysis: the algorithm dimensions plus whatever AI scores
+    are already settled (degenerate call defaults or a matching transcript's scores).
 
     Returns:
-        Dict with all quality scores and metadata
+        (efficiency, accuracy, helpfulness, transcript, transcript_hash, ai_scores)
     """
     db = get_db()
     try:
@@ -335,80 +509,192 @@ def analyze_call_quality(call_sid: str, use_ai: bool = True) -> Dict:
         if not metrics:
             raise ValueError(f"No metrics found for call_sid: {call_sid}")
 
-        # Calculate 5 dimensions
+        # Load the transcript once and share it across the scorers
+        turns = _load_turns(db, call_sid)
+
+        # Calculate the 3 algorithm dimensions
         efficiency = calculate_efficiency_score(metrics)
-        accuracy = calculate_accuracy_score(call_sid)
+        accuracy = calculate_accuracy_score(turns)
         helpfulness = calculate_helpfulness_score(metrics)
 
-        # AI-based dimensions (can be skipped for speed/cost)
-        if use_ai:
-            naturalness = calculate_naturalness_score(call_sid)
-            professionalism = calculate_professionalism_score(call_sid)
-        else:
-            naturalness = 75.0  # Default
-            professionalism = 75.0  # Default
-
-        # Calculate overall
-        dimensions = {
-            "efficiency": efficiency,
-            "accuracy": accuracy,
-            "helpfulness": helpfulness,
-            "naturalness": naturalness,
-            "professionalism": professionalism
-        }
+        transcript = _sampled_transcript(turns)
+        transcript_hash = _transcript_hash(transcript)
 
-        overall, tier = calculate_overall_score(dimensions)
+        # Degenerate call: settle on the defaults without asking Claude (and don't leave it pending).
+        # No hash, so these defaults are never reused as real scores for a matching transcript.
+        if not ai_scores and _skip_ai_scoring(metrics, transcript):
+            ai_scores = (75.0, 75.0)
+            transcript_hash = None
 
-        # Save to database
+        if not ai_scores and use_ai:
+            # Same transcript already scored? Reuse it instead of asking Claude again
+            ai_scores = _cached_ai_scores(db, [transcript_hash]).get(transcript_hash)
+
+        return efficiency, accuracy, helpfulness, transcript, transcript_hash, ai_scores
+
+    finally:
+        db.close()
+
+
+def _save_quality(
+    call_sid: str,
+    dimensions: Dict[str, float],
+    overall: float,
+    tier: str,
+    needs_ai: bool,
+    transcript_hash: Optional[str]
+):
+    """Blocking DB half of the analysis: insert or update the call's CallQuality row"""
+    db = get_db()
+    try:
         quality = db.query(CallQuality).filter(CallQuality.call_sid == call_sid).first()
 
         if quality:
             # Update existing
-            quality.efficiency_score = efficiency
-            quality.accuracy_score = accuracy
-            quality.helpfulness_score = helpfulness
-            quality.naturalness_score = naturalness
-            quality.professionalism_score = professionalism
+            quality.efficiency_score = dimensions["efficiency"]
+            quality.accuracy_score = dimensions["accuracy"]
+            quality.helpfulness_score = dimensions["helpfulness"]
+            quality.naturalness_score = dimensions["naturalness"]
+            quality.professionalism_score = dimensions["professionalism"]
             quality.overall_score = overall
             quality.quality_tier = tier
+            quality.needs_ai = needs_ai
+            quality.transcript_hash = transcript_hash
             quality.analyzed_at = datetime.utcnow()
         else:
             # Create new
             quality = CallQuality(
                 call_sid=call_sid,
-                efficiency_score=efficiency,
-                accuracy_score=accuracy,
-                helpfulness_score=helpfulness,
-                naturalness_score=naturalness,
-                professionalism_score=professionalism,
+                efficiency_score=dimensions["efficiency"],
+                accuracy_score=dimensions["accuracy"],
+                helpfulness_score=dimensions["helpfulness"],
+                naturalness_score=dimensions["naturalness"],
+                professionalism_score=dimensions["professionalism"],
                 overall_score=overall,
                 quality_tier=tier,
+                needs_ai=needs_ai,
+                transcript_hash=transcript_hash,
                 analyzed_at=datetime.utcnow()
             )
             db.add(quality)
 
         db.commit()
 
-        return {
-            "call_sid": call_sid,
-            "dimensions": dimensions,
-            "overall_score": overall,
-            "quality_tier": tier,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-
-    except Exception as e:
+    except Exception:
         db.rollback()
-        raise e
+        raise
     finally:
         db.close()
 
 
+async def analyze_call_quality(
+    call_sid: str,
+    use_ai: bool = True,
+    ai_scores: Optional[Tuple[float, float]] = None
+) -> Dict:
+    """
+    Analyze call quality across all 5 dimensions.
+    DB work runs in a worker thread so it never blocks the event loop (live webhooks);
+    only the Claude request is awaited natively.
+
+    Args:
+        call_sid: Twilio call SID
+        use_ai: Whether to use AI for naturalness/professionalism (default True)
+        ai_scores: Precomputed (naturalness, professionalism), e.g. from a batch - skips the AI call
+
+    Returns:
+        Dict with all quality scores and metadata
+    """
+    # Analyzed moments ago? Serve that result (precomputed AI scores always get written)
+    if ai_scores is None:
+        cached = get_cached_quality(call_sid, use_ai)
+        if cached is not None:
+            return cached
+
+    efficiency, accuracy, helpfulness, transcript, transcript_hash, ai_scores = await asyncio.to_thread(
+        _score_call, call_sid, use_ai, ai_scores
+    )
+
+    # AI-based dimensions (can be skipped for speed/cost) - one request scores both
+    if not ai_scores and use_ai:
+        ai_scores = await _try_score_ai_dimensions(transcript)
+
+    # Keep the defaults and leave the call pending if AI scoring was skipped or failed
+    needs_ai = ai_scores is None
+    naturalness, professionalism = ai_scores or (75.0, 75.0)
+
+    # Calculate overall
+    dimensions = {
+        "efficiency": efficiency,
+        "accuracy": accuracy,
+        "helpfulness": helpfulness,
+        "naturalness": naturalness,
+        "professionalism": professionalism
+    }
+
+    overall, tier = calculate_overall_score(dimensions)
+
+    # Save to database
+    await asyncio.to_thread(_save_quality, call_sid, dimensions, overall, tier, needs_ai, transcript_hash)
+
+    result = {
+        "call_sid": call_sid,
+        "dimensions": dimensions,
+        "overall_score": overall,
+        "quality_tier": tier,
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+    # A failed AI pass isn't cached, so the next request retries it
+    if use_ai and needs_ai:
+        invalidate_quality(call_sid)
+    else:
+        cache_quality(call_sid, use_ai, result)
+
+    return result
+
+
 # ==================== BATCH ANALYSIS ====================
 
-def analyze_pending_calls(limit: int = 20) -> List[Dict]:
+def _load_pending(limit: int):
+    """
+    Blocking DB half of analyze_pending_calls.
+
+    Returns:
+        (call_sids, transcripts, skipped call_sids, transcript hashes, cached AI scores by hash)
+    """
+    db = get_db()
+    try:
+        # Find calls without quality analysis or still waiting on AI scores
+        already_scored = exists().where(
+            CallQuality.call_sid == CallMetrics.call_sid,
+            CallQuality.needs_ai == False  # Quality record with real AI scores
+        )
+        pending = db.query(CallMetrics).filter(~already_scored).limit(limit).all()
+
+        call_sids = [metrics.call_sid for metrics in pending]
+        transcripts = {metrics.call_sid: _load_transcript(db, metrics.call_sid) for metrics in pending}
+
+        # Degenerate calls get default AI scores in analyze_call_quality - don't batch them
+        skipped = {
+            metrics.call_sid for metrics in pending
+            if _skip_ai_scoring(metrics, transcripts[metrics.call_sid])
+        }
+
+        # Reuse AI scores for transcripts that were already scored
+        hashes = {call_sid: _transcript_hash(transcript) for call_sid, transcript in transcripts.items()}
+        cached = _cached_ai_scores(db, list(hashes.values()))
+
+        return call_sids, transcripts, skipped, hashes, cached
+
+    finally:
+        db.close()
+
+
+async def analyze_pending_calls(limit: int = 20) -> List[Dict]:
     """
     Analyze calls that haven't been analyzed yet (batch processing).
+    AI scores for all pending calls come from a single Message Batch.
 
     Args:
         limit: Maximum number of calls to analyze
@@ -416,24 +702,31 @@ def analyze_pending_calls(limit: int = 20) -> List[Dict]:
     Returns:
         List of analysis results
     """
-    db = get_db()
-    try:
-        # Find calls without quality analysis or with default AI scores
-        pending = db.query(CallMetrics).outerjoin(CallQuality).filter(
-            (CallQuality.call_sid == None) |  # No quality record
-            (CallQuality.naturalness_score == 75.0)  # Default value, needs AI
-        ).limit(limit).all()
-
-        results = []
-        for metrics in pending:
-            try:
-                result = analyze_call_quality(metrics.call_sid, use_ai=True)
-                results.append(result)
-                print(f"✅ Analyzed {metrics.call_sid}: {result['quality_tier']} ({result['overall_score']:.1f})")
-            except Exception as e:
-                print(f"❌ Error analyzing {metrics.call_sid}: {e}")
-
-        return results
+    # DB reads are blocking - keep them off the event loop
+    call_sids, transcripts, skipped, hashes, cached = await asyncio.to_thread(_load_pending, limit)
 
-    finally:
-        db.close()
\ No newline at end of file
+    # Degenerate calls keep the defaults (and no hash), same as on the single-call path
+    ai_scores = {
+        call_sid: cached[h] for call_sid, h in hashes.items()
+        if h in cached and call_sid not in skipped
+    }
+    ai_scores.update(await score_ai_dimensions_batch({
+        call_sid: transcript for call_sid, transcript in transcripts.items()
+        if call_sid not in ai_scores and call_sid not in skipped
+    }))
+
+    outcomes = await asyncio.gather(
+        *(analyze_call_quality(call_sid, use_ai=False, ai_scores=ai_scores.get(call_sid)) for call_sid in call_sids),
+        return_exceptions=True
+    )
+
+    results = []
+    for call_sid, outcome in zip(call_sids, outcomes):
+        if isinstance(outcome, Exception):
+            print(f"❌ Error analyzing {call_sid}: {outcome}")
+            continue
+
+        results.append(outcome)
+        print(f"✅ Analyzed {call_sid}: {outcome['quality_tier']} ({outcome['overall_score']:.1f})")
+
+    return results
@@ -0,0 +1,46 @@
+"""
+Quality Cache - Recent analyze_call_quality results, kept for a short TTL
+Admin views (and tests) re-analyze the same call back to back; serving the
+last result skips re-reading the turns and re-scoring.
+"""
+import copy
+import os
+import threading
+from typing import Dict, Optional
+
+from cachetools import TTLCache
+
+# How long a result is served before the call is analyzed again
+METRICS_CACHE_TTL_SECONDS = float(os.getenv("METRICS_CACHE_TTL_SECONDS", "60"))
+METRICS_CACHE_SIZE = 1024
+
+# (call_sid, use_ai) -> result dict
+_cache = TTLCache(maxsize=METRICS_CACHE_SIZE, ttl=METRICS_CACHE_TTL_SECONDS)
+_cache_lock = threading.Lock()
+
+
+def get_cached_quality(call_sid: str, use_ai: bool) -> Optional[Dict]:
+    """
+    Return a copy of the cached result for this call, or None.
+    An AI-scored result also answers algorithm-only (use_ai=False) requests.
+    """
+    with _cache_lock:
+        result = _cache.get((call_sid, use_ai))
+        if result is None and not use_ai:
+            result = _cache.get((call_sid, True))
+    # Callers may modify the dict, so hand out a copy
+    return copy.deepcopy(result) if result is not None else None
+
+
+def cache_quality(call_sid: str, use_ai: bool, result: Dict):
+    """Store a fresh result, dropping any other cached result for the same call"""
+    with _cache_lock:
+        _cache.pop((call_sid, not use_ai), None)
+        _cache[(call_sid, use_ai)] = copy.deepcopy(result)
+
+
+def invalidate_quality(call_sid: str):
+    """Forget every cached result for a call"""
+    with _cache_lock:
+        _cache.pop((call_sid, False), None)
+        _cache.pop((call_sid, True), None)
@@ -0,0 +1,47 @@
+"""
+Quality Worker - Score finished calls in the background
+The call-ended webhook only enqueues the call_sid, so Twilio gets its
+response as soon as the raw metrics are saved.
+"""
+import asyncio
+from typing import List
+
+from app.services.quality_analyzer import analyze_call_quality
+
+# Max calls scored per worker wake-up
+BATCH_SIZE = 8
+
+# Call SIDs waiting for quality analysis
+quality_queue: asyncio.Queue = asyncio.Queue()
+
+
+async def _analyze_batch(call_sids: List[str]):
+    """Run quick quality analysis (algorithm-based, no AI) for a batch of calls"""
+    outcomes = await asyncio.gather(
+        *(analyze_call_quality(call_sid, use_ai=False) for call_sid in call_sids),
+        return_exceptions=True
+    )
+
+    for call_sid, outcome in zip(call_sids, outcomes):
+        if isinstance(outcome, Exception):
+            print(f"⚠️  Quality analysis for {call_sid} will run later: {outcome}")
+        else:
+            print(f"📈 Quality for {call_sid}: {outcome['overall_score']:.1f}/100 ({outcome['quality_tier']})")
+
+
+async def quality_worker():
+    """
+    Long-running task: pull call SIDs off the queue and score them.
+    Start this once on app startup.
+    """
+    while True:
+        # Wait for one call, then grab whatever else is already queued
+        call_sids = [await quality_queue.get()]
+        while len(call_sids) < BATCH_SIZE and not quality_queue.empty():
+            call_sids.append(quality_queue.get_nowait())
+
+        try:
+            await _analyze_batch(call_sids)
+        finally:
+            for _ in call_sids:
+                quality_queue.task_done()
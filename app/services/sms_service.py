@@ -2,13 +2,79 @@
 SMS Service - Send confirmation messages via Twilio (trial-safe)
 """
 import os
+import atexit
+import calendar
+import queue
+import threading
+from time import monotonic
+from concurrent.futures import Future
+from functools import lru_cache
 import certifi
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from twilio.rest import Client
 from twilio.http.http_client import TwilioHttpClient
-from datetime import datetime
 
-load_dotenv()
+# Set once .env has been read, so building another SMSService doesn't re-parse it
+_DOTENV_LOADED = False
+
+
+def _ensure_env():
+    """Load .env into the environment (first call only)"""
+    global _DOTENV_LOADED
+    if not _DOTENV_LOADED:
+        load_dotenv()
+        _DOTENV_LOADED = True
+
+
+# Month abbreviations for SMS dates (index = month - 1)
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+
+# ---------- formatting helpers ----------
+# Module-level (not methods) so lru_cache doesn't hold on to SMSService instances.
+# The same reservation dates and times repeat all day, so most calls are cache hits.
+
+# Hand-parsed instead of strptime/strftime - these run on every SMS
+@lru_cache(maxsize=512)
+def _format_date(date_str: str) -> str:
+    try:
+        year, month, day = date_str.split("-")
+        if len(year) != 4 or not (year + month + day).isdigit() or len(month) > 2 or len(day) > 2:
+            raise ValueError(date_str)
+        y, m, d = int(year), int(month), int(day)
+        if not 1 <= d <= calendar.monthrange(y, m)[1]:  # also rejects a bad month
+            raise ValueError(date_str)
+        return f"{_MONTHS[m - 1]} {d:02d}, {y}"  # short: "Jan 02, 2026"
+    except Exception:
+        return date_str
+
+
+@lru_cache(maxsize=512)
+def _format_time(time_str: str) -> str:
+    try:
+        hour, minute = time_str.split(":")
+        if not (hour + minute).isdigit() or len(hour) > 2 or len(minute) > 2:
+            raise ValueError(time_str)
+        h, mn = int(hour), int(minute)
+        if h > 23 or mn > 59:
+            raise ValueError(time_str)
+        suffix = "am" if h < 12 else "pm"
+        return f"{h % 12 or 12}:{mn:02d}{suffix}"  # "6:30pm"
+    except Exception:
+        return time_str
+
+
+def _strip_non_gsm(s: str) -> str:
+    """
+    Conservative approach: remove emojis / non-basic chars that may push into Unicode.
+    Keeps typical punctuation and ASCII.
+    """
+    # Both steps are single C-level passes - no per-character Python loop, no cache needed
+    if s.isascii():
+        return s
+    return s.encode("ascii", "ignore").decode("ascii")
 
 
 class SMSService:
@@ -17,8 +83,31 @@ class SMSService:
     # Leave buffer because Twilio trial may prepend a disclaimer
     TRIAL_SAFE_LEN = 145
 
+    # Dispatcher batching: after the first queued SMS, wait up to BATCH_WINDOW_SEC
+    # for more (max MAX_BATCH), then send them back-to-back on the warm connection
+    MAX_BATCH = 16
+    BATCH_WINDOW_SEC = 0.02
+
+    # Trial-safe short templates, plus even shorter fallbacks
+    _CONFIRMATION_TEMPLATE = (
+        "Luigi's Italian\n"
+        "Confirmed: {name}\n"
+        "{d} {t}{table_info}\n"
+        "Party {party_size}. 123 Main St SJ."
+    )
+    _CONFIRMATION_FALLBACK_TEMPLATE = "Luigi's: Confirmed for {name}, {d} {t}. Party {party_size}."
+    _CANCELLATION_TEMPLATE = (
+        "Luigi's Italian\n"
+        "Cancelled: {name}\n"
+        "{d} {t}\n"
+        "Call 408-555-LUIGI to rebook."
+    )
+    _CANCELLATION_FALLBACK_TEMPLATE = "Luigi's: Cancelled for {name}, {d} {t}. Call 408-555-LUIGI."
+
     def __init__(self):
         """Initialize Twilio SMS client with proper SSL configuration"""
+        _ensure_env()
+
         account_sid = os.getenv("TWILIO_ACCOUNT_SID")
         auth_token = os.getenv("TWILIO_AUTH_TOKEN")
         self.from_phone = os.getenv("TWILIO_PHONE_NUMBER")
@@ -35,32 +124,23 @@ class SMSService:
             http_client = TwilioHttpClient()
             http_client.session.verify = certifi.where()
 
-            self.client = Client(account_sid, auth_token, http_client=http_client)
+            # Pooled keep-alive connections so back-to-back SMS sends reuse one TLS session.
+            # Retries cover connection failures and 5xx on idempotent requests; urllib3 won't
+            # replay a POST after the server got it, so a message is never sent twice.
+            adapter = HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=16,
+                max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504))
+            )
+            http_client.session.mount("https://", adapter)
 
-    # ---------- formatting helpers ----------
-    @staticmethod
-    def _format_date(date_str: str) -> str:
-        try:
-            dt = datetime.strptime(date_str, "%Y-%m-%d")
-            return dt.strftime("%b %d, %Y")  # short: "Jan 02, 2026"
-        except Exception:
-            return date_str
+            self.client = Client(account_sid, auth_token, http_client=http_client)
 
-    @staticmethod
-    def _format_time(time_str: str) -> str:
-        try:
-            t = datetime.strptime(time_str, "%H:%M")
-            return t.strftime("%I:%M%p").lstrip("0").lower()  # "6:30pm"
-        except Exception:
-            return time_str
-
-    @staticmethod
-    def _strip_non_gsm(s: str) -> str:
-        """
-        Conservative approach: remove emojis / non-basic chars that may push into Unicode.
-        Keeps typical punctuation and ASCII.
-        """
-        return "".join(ch for ch in s if ord(ch) < 128)
+            # Queued sends, drained in batches by one background dispatcher thread
+            self._outbox: queue.Queue = queue.Queue()
+            self._dispatcher = threading.Thread(target=self._dispatch_loop, name="sms-dispatcher", daemon=True)
+            self._dispatcher.start()
+            atexit.register(self._flush_outbox)
 
     def _enforce_trial_limit(self, message: str) -> str:
         """
@@ -72,7 +152,7 @@ class SMSService:
             return message
 
         if len(message) > self.TRIAL_SAFE_LEN:
-            message = self._strip_non_gsm(message)
+            message = _strip_non_gsm(message)
 
         if len(message) > self.TRIAL_SAFE_LEN:
             message = message[: self.TRIAL_SAFE_LEN - 3] + "..."
@@ -83,45 +163,89 @@ class SMSService:
     def _build_confirmation_message(
             self, name: str, party_size: int, date: str, time: str, table_number: int = None
     ) -> str:
-        d = self._format_date(date)
-        t = self._format_time(time)
-        table_info = f" Table {table_number}" if table_number else ""
+        fields = {
+            "name": name,
+            "party_size": party_size,
+            "d": _format_date(date),
+            "t": _format_time(time),
+            "table_info": f" Table {table_number}" if table_number else ""
+        }
 
         # Trial-safe short template
-        msg = (
-            f"Luigi's Italian\n"
-            f"Confirmed: {name}\n"
-            f"{d} {t}{table_info}\n"
-            f"Party {party_size}. 123 Main St SJ."
-        )
+        msg = self._enforce_trial_limit(self._CONFIRMATION_TEMPLATE.format_map(fields))
 
         # If for some reason still long, fallback even shorter
-        msg = self._enforce_trial_limit(msg)
         if self.is_trial and len(msg) > self.TRIAL_SAFE_LEN:
-            msg = f"Luigi's: Confirmed for {name}, {d} {t}. Party {party_size}."
-            msg = self._enforce_trial_limit(msg)
+            msg = self._enforce_trial_limit(self._CONFIRMATION_FALLBACK_TEMPLATE.format_map(fields))
 
         return msg
 
     def _build_cancellation_message(self, name: str, date: str, time: str) -> str:
-        d = self._format_date(date)
-        t = self._format_time(time)
-
-        msg = (
-            f"Luigi's Italian\n"
-            f"Cancelled: {name}\n"
-            f"{d} {t}\n"
-            f"Call 408-555-LUIGI to rebook."
-        )
+        fields = {"name": name, "d": _format_date(date), "t": _format_time(time)}
 
-        msg = self._enforce_trial_limit(msg)
+        msg = self._enforce_trial_limit(self._CANCELLATION_TEMPLATE.format_map(fields))
         if self.is_trial and len(msg) > self.TRIAL_SAFE_LEN:
-            msg = f"Luigi's: Cancelled for {name}, {d} {t}. Call 408-555-LUIGI."
-            msg = self._enforce_trial_limit(msg)
+            msg = self._enforce_trial_limit(self._CANCELLATION_FALLBACK_TEMPLATE.format_map(fields))
 
         return msg
 
+    # ---------- sending ----------
+    @staticmethod
+    def _resolved(value: bool) -> Future:
+        """Already-finished Future, so callers get the same return type either way"""
+        future = Future()
+        future.set_result(value)
+        return future
+
+    def _enqueue(self, to_phone: str, message: str, label: str) -> Future:
+        """Queue an SMS for the dispatcher thread"""
+        future = Future()
+        self._outbox.put((to_phone, message, label, future))
+        return future
+
+    def _next_batch(self) -> list:
+        """Block for one queued SMS, then collect more for up to BATCH_WINDOW_SEC"""
+        batch = [self._outbox.get()]
+        deadline = monotonic() + self.BATCH_WINDOW_SEC
+        while len(batch) < self.MAX_BATCH and batch[-1] is not None:
+            remaining = deadline - monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._outbox.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _dispatch_loop(self):
+        """Dispatcher thread: send queued messages back-to-back, resolving their Futures"""
+        while True:
+            batch = self._next_batch()
+            for item in batch:
+                if item is None:  # Shutdown sentinel from _flush_outbox
+                    return
+                to_phone, message, label, future = item
+                future.set_result(self._send(to_phone, message, label))
+
+    def _flush_outbox(self, timeout: float = 5.0):
+        """On exit, give already-queued messages a chance to go out"""
+        self._outbox.put(None)
+        self._dispatcher.join(timeout)
+
+    def _send(self, to_phone: str, message: str, label: str) -> bool:
+        """Blocking Twilio send - runs on the dispatcher thread"""
+        try:
+            msg = self.client.messages.create(body=message, from_=self.from_phone, to=to_phone)
+            print(f"✅ {label} sent to {to_phone}: {msg.sid}")
+            return True
+
+        except Exception as e:
+            print(f"❌ Failed to send {label}: {e}")
+            return False
+
     # ---------- public APIs ----------
+    # Sends run in the background so a live call never waits on Twilio.
+    # Each returns a Future resolving to True if the SMS was sent.
     def send_confirmation_sms(
             self,
             to_phone: str,
@@ -130,37 +254,21 @@ class SMSService:
             date: str,
             time: str,
             table_number: int = None
-    ) -> bool:
+    ) -> Future:
         if not self.client:
             print("⚠️  SMS not configured - skipping")
-            return False
+            return self._resolved(False)
 
         message = self._build_confirmation_message(name, party_size, date, time, table_number)
+        return self._enqueue(to_phone, message, "SMS")
 
-        try:
-            msg = self.client.messages.create(body=message, from_=self.from_phone, to=to_phone)
-            print(f"✅ SMS sent to {to_phone}: {msg.sid}")
-            return True
-
-        except Exception as e:
-            print(f"❌ Failed to send SMS: {e}")
-            return False
-
-    def send_cancellation_sms(self, to_phone: str, name: str, date: str, time: str) -> bool:
+    def send_cancellation_sms(self, to_phone: str, name: str, date: str, time: str) -> Future:
         if not self.client:
             print("⚠️  SMS not configured - skipping")
-            return False
+            return self._resolved(False)
 
         message = self._build_cancellation_message(name, date, time)
-
-        try:
-            msg = self.client.messages.create(body=message, from_=self.from_phone, to=to_phone)
-            print(f"✅ Cancellation SMS sent to {to_phone}: {msg.sid}")
-            return True
-
-        except Exception as e:
-            print(f"❌ Failed to send cancellation SMS: {e}")
-            return False
+        return self._enqueue(to_phone, message, "cancellation SMS")
 
 
 # Create singleton instance
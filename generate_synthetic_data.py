@@ -11,6 +11,7 @@ Run this to populate your dashboard with demo data!
 """
 import sys
 import os
+import re
 from datetime import datetime, timedelta
 import random
 
@@ -18,9 +19,11 @@ import random
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.services.database import get_db, CallMetrics, CallQuality, ConversationTurn
+from app.services.quality_analyzer import classify_user_turn
 
 
 # ==================== SYNTHETIC DATA TEMPLATES ====================
+# "duration" and each "scores" entry are (low, high) ranges - every generated call draws its own values
 
 CALL_TEMPLATES = [
     # EXCELLENT CALLS (90-100)
@@ -28,7 +31,7 @@ CALL_TEMPLATES = [
         "tier": "Excellent",
         "user_turns": 3,
         "agent_turns": 3,
-        "duration": random.randint(45, 75),
+        "duration": (45, 75),
         "clarifications": 0,
         "booking_completed": True,
         "tools": ["get_current_date", "check_availability", "create_reservation"],
@@ -42,11 +45,11 @@ CALL_TEMPLATES = [
             ("user", "Thank you!")
         ],
         "scores": {
-            "efficiency": random.uniform(88, 98),
-            "accuracy": random.uniform(95, 100),
-            "helpfulness": 100,
-            "naturalness": random.uniform(85, 95),
-            "professionalism": random.uniform(90, 98)
+            "efficiency": (88, 98),
+            "accuracy": (95, 100),
+            "helpfulness": (100, 100),
+            "naturalness": (85, 95),
+            "professionalism": (90, 98)
         }
     },
 
@@ -55,7 +58,7 @@ CALL_TEMPLATES = [
         "tier": "Great",
         "user_turns": 4,
         "agent_turns": 4,
-        "duration": random.randint(80, 120),
+        "duration": (80, 120),
         "clarifications": 0,
         "booking_completed": True,
         "tools": ["get_current_date", "check_availability", "create_reservation"],
@@ -71,11 +74,11 @@ CALL_TEMPLATES = [
             ("user", "Great, thanks!")
         ],
         "scores": {
-            "efficiency": random.uniform(75, 87),
-            "accuracy": random.uniform(88, 95),
-            "helpfulness": 100,
-            "naturalness": random.uniform(75, 85),
-            "professionalism": random.uniform(82, 90)
+            "efficiency": (75, 87),
+            "accuracy": (88, 95),
+            "helpfulness": (100, 100),
+            "naturalness": (75, 85),
+            "professionalism": (82, 90)
         }
     },
 
@@ -84,7 +87,7 @@ CALL_TEMPLATES = [
         "tier": "Good",
         "user_turns": 6,
         "agent_turns": 6,
-        "duration": random.randint(120, 180),
+        "duration": (120, 180),
         "clarifications": 1,
         "booking_completed": True,
         "tools": ["get_current_date", "check_availability", "create_reservation"],
@@ -104,11 +107,11 @@ CALL_TEMPLATES = [
             ("user", "Okay, thanks")
         ],
         "scores": {
-            "efficiency": random.uniform(55, 70),
-            "accuracy": random.uniform(75, 88),
-            "helpfulness": 100,
-            "naturalness": random.uniform(65, 75),
-            "professionalism": random.uniform(70, 80)
+            "efficiency": (55, 70),
+            "accuracy": (75, 88),
+            "helpfulness": (100, 100),
+            "naturalness": (65, 75),
+            "professionalism": (70, 80)
         }
     },
 
@@ -117,7 +120,7 @@ CALL_TEMPLATES = [
         "tier": "Fair",
         "user_turns": 8,
         "agent_turns": 8,
-        "duration": random.randint(180, 240),
+        "duration": (180, 240),
         "clarifications": 3,
         "booking_completed": True,
         "tools": ["get_current_date", "check_availability", "check_availability", "create_reservation"],
@@ -142,11 +145,11 @@ CALL_TEMPLATES = [
             ("user", "David Lee")
         ],
         "scores": {
-            "efficiency": random.uniform(35, 50),
-            "accuracy": random.uniform(60, 75),
-            "helpfulness": 100,
-            "naturalness": random.uniform(50, 65),
-            "professionalism": random.uniform(60, 70)
+            "efficiency": (35, 50),
+            "accuracy": (60, 75),
+            "helpfulness": (100, 100),
+            "naturalness": (50, 65),
+            "professionalism": (60, 70)
         }
     },
 
@@ -155,7 +158,7 @@ CALL_TEMPLATES = [
         "tier": "Poor",
         "user_turns": 5,
         "agent_turns": 5,
-        "duration": random.randint(90, 150),
+        "duration": (90, 150),
         "clarifications": 2,
         "booking_completed": False,
         "tools": ["check_availability"],
@@ -172,11 +175,11 @@ CALL_TEMPLATES = [
             ("user", "*hangs up*")
         ],
         "scores": {
-            "efficiency": random.uniform(15, 35),
-            "accuracy": random.uniform(40, 60),
-            "helpfulness": 0,
-            "naturalness": random.uniform(30, 45),
-            "professionalism": random.uniform(50, 65)
+            "efficiency": (15, 35),
+            "accuracy": (40, 60),
+            "helpfulness": (0, 0),
+            "naturalness": (30, 45),
+            "professionalism": (50, 65)
         }
     }
 ]
@@ -190,43 +193,47 @@ CALLER_NAMES = [
     "Amelia Jackson", "Matthew White", "Harper Harris", "David Martin"
 ]
 
+# Progress-line marker for each quality tier
+_TIER_EMOJI = {
+    "Excellent": "🌟",
+    "Great": "✅",
+    "Good": "👍",
+    "Fair": "⚠️",
+    "Poor": "🔴"
+}
+
+# Caller names written into the template conversations - swapped for the generated caller
+_NAME_RE = re.compile(r"Sarah Johnson|Michael Chen|Jessica Martinez|David Lee")
+
 
 # ==================== DATA GENERATION FUNCTIONS ====================
 
 def generate_call_sid():
-    """Generate a realistic Twilio call SID"""
-    import string
-    chars = string.ascii_uppercase + string.digits
-    return "CA" + ''.join(random.choices(chars, k=32))
+    """Generate a realistic Twilio call SID ("CA" + 32 hex chars)"""
+    return "CA" + os.urandom(16).hex()
+
+
+# Module-level generator so the helpers and the main loop skip the `random.` lookups
+_rng = random.Random()
+
+_AREA_CODES = (408, 650, 415, 510, 925, 669)
 
 
 def generate_phone_number():
     """Generate a realistic US phone number"""
-    area_code = random.choice([408, 650, 415, 510, 925, 669])
-    exchange = random.randint(200, 999)
-    number = random.randint(1000, 9999)
-    return f"+1{area_code}{exchange}{number}"
+    # One draw covers exchange (200-999) and line number (1000-9999)
+    exchange, number = divmod(_rng.randrange(800 * 9000), 9000)
+    return f"+1{_rng.choice(_AREA_CODES)}{exchange + 200}{number + 1000}"
 
 
-def calculate_overall_score(scores):
-    """Calculate weighted overall score"""
-    weights = {
-        "accuracy": 0.30,
-        "helpfulness": 0.25,
-        "efficiency": 0.20,
-        "naturalness": 0.15,
-        "professionalism": 0.10
-    }
+# Dimension weights (same as the quality analyzer), as parallel tuples
+_ORDER = ("accuracy", "helpfulness", "efficiency", "naturalness", "professionalism")
+_WEIGHTS = (0.30, 0.25, 0.20, 0.15, 0.10)
 
-    overall = (
-            scores["efficiency"] * weights["efficiency"] +
-            scores["accuracy"] * weights["accuracy"] +
-            scores["helpfulness"] * weights["helpfulness"] +
-            scores["naturalness"] * weights["naturalness"] +
-            scores["professionalism"] * weights["professionalism"]
-    )
 
-    return overall
+def calculate_overall_score(scores):
+    """Calculate weighted overall score (scores is a tuple in _ORDER)"""
+    return sum(score * w for score, w in zip(scores, _WEIGHTS))
 
 
 def get_quality_tier(score):
@@ -255,33 +262,43 @@ def generate_synthetic_calls(num_calls=20):
         # Spread calls across last 7 days
         now = datetime.utcnow()
 
-        for i in range(num_calls):
-            # Pick a random template
-            template = random.choice(CALL_TEMPLATES)
-
+        # Rows are collected as plain dicts and bulk-inserted once per table at the end
+        metrics_rows = []
+        turn_rows = []
+        quality_rows = []
+        progress = []
+
+        # Local bindings for the per-call draws
+        randint, uniform = _rng.randint, _rng.uniform
+
+        # Draw every call's categorical picks up front, one choices() call each
+        templates = _rng.choices(CALL_TEMPLATES, k=num_calls)
+        days_ago_draws = _rng.choices(
+            range(7),
+            weights=[5, 5, 4, 3, 2, 1, 1],  # More recent calls weighted higher
+            k=num_calls
+        )
+        minutes_ago_draws = _rng.choices(range(24 * 60), k=num_calls)  # Any time of day
+        caller_names = _rng.choices(CALLER_NAMES, k=num_calls)
+        prompt_versions = _rng.choices(["v1_baseline", "v2_friendly", "v3_efficient"], k=num_calls)
+
+        for i, (template, days_ago, minutes_ago, caller_name, prompt_version) in enumerate(
+                zip(templates, days_ago_draws, minutes_ago_draws, caller_names, prompt_versions)
+        ):
             # Generate timestamp (spread across 7 days, weighted toward recent)
-            days_ago = random.choices(
-                range(7),
-                weights=[5, 5, 4, 3, 2, 1, 1],  # More recent calls weighted higher
-                k=1
-            )[0]
-            hours_ago = random.randint(0, 23)
-            minutes_ago = random.randint(0, 59)
-
-            call_time = now - timedelta(days=days_ago, hours=hours_ago, minutes=minutes_ago)
+            call_time = now - timedelta(days=days_ago, minutes=minutes_ago)
 
             # Generate call data
             call_sid = generate_call_sid()
             caller_phone = generate_phone_number()
-            caller_name = random.choice(CALLER_NAMES)
-            duration = template["duration"] + random.uniform(-10, 10)
+            duration = randint(*template["duration"]) + uniform(-10, 10)
 
             # Calculate latency (realistic: 1-3 seconds per API call)
             num_tools = len(template["tools"])
-            latency_ms = num_tools * random.uniform(1000, 3000)
+            latency_ms = num_tools * uniform(1000, 3000)
 
             # Create CallMetrics
-            metrics = CallMetrics(
+            metrics_rows.append(dict(
                 call_sid=call_sid,
                 call_start=call_time,
                 call_end=call_time + timedelta(seconds=duration),
@@ -295,58 +312,56 @@ def generate_synthetic_calls(num_calls=20):
                 tools_called=template["tools"],
                 total_latency_ms=latency_ms,
                 api_errors=0,
-                prompt_version=random.choice(["v1_baseline", "v2_friendly", "v3_efficient"]),
+                prompt_version=prompt_version,
                 caller_phone=caller_phone,
                 created_at=call_time
-            )
-            db.add(metrics)
+            ))
 
             # Create ConversationTurns
             for turn_num, (speaker, text) in enumerate(template["conversation"], 1):
-                turn = ConversationTurn(
+                has_correction, has_confirmation = classify_user_turn(text) if speaker == "user" else (False, False)
+                turn_rows.append(dict(
                     call_sid=call_sid,
                     turn_number=turn_num,
                     speaker=speaker,
-                    transcript=text.replace("Sarah Johnson", caller_name)
-                    .replace("Michael Chen", caller_name)
-                    .replace("Jessica Martinez", caller_name)
-                    .replace("David Lee", caller_name),
-                    timestamp=call_time + timedelta(seconds=turn_num * 10)
-                )
-                db.add(turn)
+                    transcript=_NAME_RE.sub(caller_name, text),
+                    timestamp=call_time + timedelta(seconds=turn_num * 10),
+                    has_correction=has_correction,
+                    has_confirmation=has_confirmation
+                ))
 
             # Create CallQuality
-            scores = template["scores"].copy()
+            ranges = template["scores"]
+            scores = tuple(uniform(*ranges[dim]) for dim in _ORDER)
+            accuracy, helpfulness, efficiency, naturalness, professionalism = scores
             overall_score = calculate_overall_score(scores)
             tier = get_quality_tier(overall_score)
 
-            quality = CallQuality(
+            quality_rows.append(dict(
                 call_sid=call_sid,
-                efficiency_score=scores["efficiency"],
-                accuracy_score=scores["accuracy"],
-                helpfulness_score=scores["helpfulness"],
-                naturalness_score=scores["naturalness"],
-                professionalism_score=scores["professionalism"],
+                efficiency_score=efficiency,
+                accuracy_score=accuracy,
+                helpfulness_score=helpfulness,
+                naturalness_score=naturalness,
+                professionalism_score=professionalism,
                 overall_score=overall_score,
                 quality_tier=tier,
                 user_sentiment="satisfied" if template["booking_completed"] else "frustrated",
                 frustration_detected=not template["booking_completed"],
+                needs_ai=False,
                 analyzed_at=call_time + timedelta(seconds=duration + 5),
                 analyzer_version="v1.0"
-            )
-            db.add(quality)
-
-            # Print progress
-            tier_emoji = {
-                "Excellent": "🌟",
-                "Great": "✅",
-                "Good": "👍",
-                "Fair": "⚠️",
-                "Poor": "🔴"
-            }
-            print(f"{tier_emoji.get(tier, '📞')} Call {i+1:2d}: {tier:10s} ({overall_score:.1f}/100) - {caller_name} - {days_ago}d ago")
-
-        # Commit all data
+            ))
+
+            # Record progress (written in one go after the loop)
+            progress.append(f"{_TIER_EMOJI.get(tier, '📞')} Call {i+1:2d}: {tier:10s} ({overall_score:.1f}/100) - {caller_name} - {days_ago}d ago")
+
+        sys.stdout.write("\n".join(progress) + "\n")
+
+        # Insert all data (parents first) and commit
+        db.bulk_insert_mappings(CallMetrics, metrics_rows)
+        db.bulk_insert_mappings(ConversationTurn, turn_rows)
+        db.bulk_insert_mappings(CallQuality, quality_rows)
         db.commit()
 
         print("")
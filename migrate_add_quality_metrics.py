@@ -1,6 +1,9 @@
 """
 Migration: Add Quality Metrics Tables
 Adds 3 new tables: call_metrics, call_quality, conversation_turns
+Adds keyword flag columns to conversation_turns and backfills them
+Adds the needs_ai flag and transcript_hash to call_quality
+Indexes conversation_turns on (call_sid, turn_number)
 Does NOT modify existing tables (reservations, tables)
 """
 import sys
@@ -9,18 +12,9 @@ import os
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.services.database import Base, engine, SessionLocal
-from sqlalchemy import text
-
-
-def check_table_exists(table_name: str) -> bool:
-    """Check if a table exists in the database"""
-    session = SessionLocal()
-    try:
-        result = session.execute(text(f"SELECT name FROM sqlite_master WHERE type='table' AND name='{table_name}'"))
-        return result.fetchone() is not None
-    finally:
-        session.close()
+from app.services.database import Base, engine, SessionLocal, ConversationTurn
+from app.services.quality_analyzer import classify_user_turn
+from sqlalchemy import inspect, text
 
 
 def migrate_quality_metrics():
@@ -29,14 +23,12 @@ def migrate_quality_metrics():
     print("🔄 Starting Quality Metrics Migration...")
     print("")
 
-    # Check existing tables
+    # Check existing tables (one catalog lookup for all of them)
     print("📋 Checking existing tables...")
+    table_names = set(inspect(engine).get_table_names())
     existing_tables = {
-        "reservations": check_table_exists("reservations"),
-        "tables": check_table_exists("tables"),
-        "call_metrics": check_table_exists("call_metrics"),
-        "call_quality": check_table_exists("call_quality"),
-        "conversation_turns": check_table_exists("conversation_turns")
+        name: name in table_names
+        for name in ("reservations", "tables", "call_metrics", "call_quality", "conversation_turns")
     }
 
     for table_name, exists in existing_tables.items():
@@ -82,8 +74,106 @@ def migrate_quality_metrics():
         return False
 
 
+def migrate_turn_keyword_flags():
+    """Add has_correction/has_confirmation to conversation_turns and flag existing user turns"""
+    session = SessionLocal()
+    try:
+        columns = {column["name"] for column in inspect(engine).get_columns("conversation_turns")}
+
+        added = False
+        for column in ("has_correction", "has_confirmation"):
+            if column not in columns:
+                print(f"📝 Adding '{column}' column to conversation_turns...")
+                session.execute(text(f"ALTER TABLE conversation_turns ADD COLUMN {column} BOOLEAN DEFAULT 0"))
+                added = True
+        session.commit()
+
+        if not added:
+            print("✅ Keyword flag columns already exist")
+            return True
+
+        # Backfill flags for transcripts recorded before the columns existed
+        turns = session.query(ConversationTurn).filter(ConversationTurn.speaker == "user").all()
+        for turn in turns:
+            turn.has_correction, turn.has_confirmation = classify_user_turn(turn.transcript or "")
+        session.commit()
+
+        print(f"✅ Flagged {len(turns)} existing user turns")
+        return True
+
+    except Exception as e:
+        session.rollback()
+        print(f"❌ Keyword flag migration failed: {e}")
+        return False
+    finally:
+        session.close()
+
+
+def migrate_call_quality_columns():
+    """
+    Add indexed needs_ai (flagging rows still on default AI scores)
+    and transcript_hash columns to call_quality
+    """
+    session = SessionLocal()
+    try:
+        columns = {column["name"] for column in inspect(engine).get_columns("call_quality")}
+
+        if "needs_ai" in columns:
+            print("✅ Column 'needs_ai' already exists")
+        else:
+            print("📝 Adding 'needs_ai' column to call_quality...")
+            session.execute(text("ALTER TABLE call_quality ADD COLUMN needs_ai BOOLEAN DEFAULT 1"))
+            # Rows analyzed before this column existed used naturalness 75.0 to mean "not AI-scored yet"
+            result = session.execute(text("UPDATE call_quality SET needs_ai = (naturalness_score = 75.0)"))
+            print(f"✅ Flagged {result.rowcount} existing quality records")
+
+        session.execute(text("CREATE INDEX IF NOT EXISTS ix_call_quality_needs_ai ON call_quality (needs_ai)"))
+
+        # Transcript fingerprint for reusing AI scores (filled in as calls are analyzed)
+        if "transcript_hash" in columns:
+            print("✅ Column 'transcript_hash' already exists")
+        else:
+            print("📝 Adding 'transcript_hash' column to call_quality...")
+            session.execute(text("ALTER TABLE call_quality ADD COLUMN transcript_hash VARCHAR(64)"))
+        session.execute(text("CREATE INDEX IF NOT EXISTS ix_call_quality_transcript_hash ON call_quality (transcript_hash)"))
+
+        session.commit()
+        return True
+
+    except Exception as e:
+        session.rollback()
+        print(f"❌ call_quality migration failed: {e}")
+        return False
+    finally:
+        session.close()
+
+
+def migrate_turn_order_index():
+    """Index conversation_turns on (call_sid, turn_number) for ordered transcript reads"""
+    session = SessionLocal()
+    try:
+        session.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_turns_call_sid_turn_number ON conversation_turns (call_sid, turn_number)"
+        ))
+        session.commit()
+        print("✅ Index 'ix_turns_call_sid_turn_number' is in place")
+        return True
+
+    except Exception as e:
+        session.rollback()
+        print(f"❌ Turn index migration failed: {e}")
+        return False
+    finally:
+        session.close()
+
+
 if __name__ == "__main__":
-    success = migrate_quality_metrics()
+    success = (
+        migrate_quality_metrics()
+        and migrate_turn_keyword_flags()
+        and migrate_call_quality_columns()
+        and migrate_turn_order_index()
+    )
     if success:
         print("")
         print("🎉 You can now:")
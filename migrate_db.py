@@ -1,6 +1,7 @@
 """
 Database migration script
 Adds assigned_table_id column to existing reservations table
+Converts reservation times to the native TIME storage format and indexes (date, time)
 """
 import sys
 import os
@@ -9,11 +10,11 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.services.database import engine, SessionLocal, Reservation
-from sqlalchemy import text
+from sqlalchemy import inspect, text
 
 
 def migrate_database():
-    """Add assigned_table_id column to reservations table"""
+    """Add assigned_table_id column and date/time index to reservations table"""
 
     print("🔄 Starting database migration...")
 
@@ -21,22 +22,34 @@ def migrate_database():
 
     try:
         # Check if column already exists
-        result = session.execute(text("PRAGMA table_info(reservations)"))
-        columns = [row[1] for row in result]
+        columns = {column["name"] for column in inspect(engine).get_columns("reservations")}
 
         if 'assigned_table_id' in columns:
-            print("✅ Column 'assigned_table_id' already exists. No migration needed.")
-            return
-
-        # Add the column
-        print("📝 Adding 'assigned_table_id' column to reservations table...")
-        session.execute(text("ALTER TABLE reservations ADD COLUMN assigned_table_id INTEGER"))
+            print("✅ Column 'assigned_table_id' already exists.")
+        else:
+            # Add the column
+            print("📝 Adding 'assigned_table_id' column to reservations table...")
+            session.execute(text("ALTER TABLE reservations ADD COLUMN assigned_table_id INTEGER"))
+            session.commit()
+
+            print("✅ Migration completed successfully!")
+            print("   - Added 'assigned_table_id' column to reservations table")
+            print("   - Existing reservations will have NULL for this field (OK)")
+            print("   - New reservations will get proper table assignments")
+
+        # Reservation.time is now a TIME column; SQLite stores it as HH:MM:SS.ffffff,
+        # so legacy HH:MM strings must be widened before the ORM can read them back
+        result = session.execute(
+            text("UPDATE reservations SET time = time || :suffix WHERE length(time) = 5"),
+            {"suffix": ":00.000000"}
+        )
         session.commit()
+        if result.rowcount:
+            print(f"📝 Converted {result.rowcount} reservation times to TIME format")
 
-        print("✅ Migration completed successfully!")
-        print("   - Added 'assigned_table_id' column to reservations table")
-        print("   - Existing reservations will have NULL for this field (OK)")
-        print("   - New reservations will get proper table assignments")
+        session.execute(text("CREATE INDEX IF NOT EXISTS ix_res_date_time ON reservations (date, time)"))
+        session.commit()
+        print("✅ Index 'ix_res_date_time' is in place")
 
     except Exception as e:
         print(f"❌ Migration failed: {e}")
@@ -47,4 +60,4 @@ def migrate_database():
 
 
 if __name__ == "__main__":
-    migrate_database()
\ No newline at end of file
+    migrate_database()
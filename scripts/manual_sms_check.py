@@ -1,6 +1,6 @@
 """
-Test script for SMS service
-Run this to test SMS confirmations
+Manual check for SMS service - sends real messages through Twilio
+Run this to test SMS confirmations on your own phone (not part of the pytest suite)
 """
 import sys
 import os
@@ -11,7 +11,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from app.services.sms_service import sms_service
 
 
-def test_sms():
+def manual_sms_check():
     """Test SMS sending"""
     print("🧪 Testing SMS Service\n")
     print("=" * 60)
@@ -33,7 +33,7 @@ def test_sms():
         date="2026-01-05",
         time="19:00",
         table_number=5
-    )
+    ).result()
 
     if success:
         print("✅ Confirmation SMS sent! Check your phone.")
@@ -53,7 +53,7 @@ def test_sms():
             name="Test User",
             date="2026-01-05",
             time="19:00"
-        )
+        ).result()
 
         if success:
             print("✅ Cancellation SMS sent! Check your phone.")
@@ -68,4 +68,4 @@ def test_sms():
 
 
 if __name__ == "__main__":
-    test_sms()
\ No newline at end of file
+    manual_sms_check()
\ No newline at end of file
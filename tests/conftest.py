@@ -0,0 +1,88 @@
+"""
+Shared pytest fixtures
+Also puts the repo root on sys.path (once, before any test module is imported)
+so tests can import the app package without per-file path setup.
+"""
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services import database
+from app.services import sms_service as sms_module
+
+
+@pytest.fixture(scope="session")
+def engine():
+    """One in-memory SQLite engine (single shared connection) for the whole test session"""
+    engine = create_engine(
+        "sqlite://",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False}
+    )
+
+    # pysqlite manages BEGIN itself, which breaks SAVEPOINTs - let SQLAlchemy emit it instead
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_begin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
+    database.Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine, monkeypatch):
+    """
+    Session inside a per-test transaction that is rolled back afterwards.
+    App code calling get_db() joins the same transaction; its commits become savepoints.
+    """
+    connection = engine.connect()
+    transaction = connection.begin()
+
+    session_factory = sessionmaker(
+        bind=connection,
+        autoflush=False,
+        join_transaction_mode="create_savepoint"
+    )
+    monkeypatch.setattr(database, "SessionLocal", session_factory)
+
+    session = session_factory()
+    yield session
+
+    session.close()
+    transaction.rollback()
+    connection.close()
+
+
+@pytest.fixture
+def mock_twilio(monkeypatch):
+    """
+    Swap the module-level sms_service for one built on a mocked Twilio Client.
+    Returns the mock client - sent messages show up on mock_twilio.messages.create.
+    """
+    monkeypatch.setenv("TWILIO_ACCOUNT_SID", "ACtest")
+    monkeypatch.setenv("TWILIO_AUTH_TOKEN", "test-token")
+    monkeypatch.setenv("TWILIO_PHONE_NUMBER", "+14085550000")
+
+    client = MagicMock()
+    client.messages.create.return_value.sid = "SMtest"
+    monkeypatch.setattr(sms_module, "Client", MagicMock(return_value=client))
+
+    service = sms_module.SMSService()
+    monkeypatch.setattr(sms_module, "sms_service", service)
+
+    yield client
+
+    # Stop this service's dispatcher thread
+    service._flush_outbox()
@@ -0,0 +1,23 @@
+"""
+Tests for the date tool
+get_current_date gives Claude what "today", "tomorrow" and "next week" mean
+"""
+from datetime import date, datetime, timedelta
+
+from app.agent.tools.reservation_tools import get_current_date
+
+
+def test_date_tool():
+    """Relative dates line up with the current datetime"""
+    result = get_current_date()
+
+    now = datetime.fromisoformat(result["current_datetime"])
+    today = date.fromisoformat(result["today"])
+
+    assert today == now.date()
+    assert date.fromisoformat(result["tomorrow"]) == today + timedelta(days=1)
+    assert date.fromisoformat(result["next_week"]) == today + timedelta(days=7)
+    assert result["today_day_of_week"] == today.strftime("%A")
+    assert result["tomorrow_day_of_week"] == (today + timedelta(days=1)).strftime("%A")
+    assert result["current_time"] == now.strftime("%H:%M")
+    assert (result["year"], result["month"], result["day"]) == (today.year, today.month, today.day)
@@ -0,0 +1,43 @@
+"""
+Tests for fuzzy name matching
+Names must still match through speech recognition errors
+"""
+import pytest
+
+from app.agent.tools.reservation_tools import fuzzy_match_name, fuzzy_match_many
+
+
+NAME_CASES = [
+    # (what user said, what's in DB, should match?)
+    ("Raji", "Ragi", True),           # Scenario 7
+    ("Raggy", "Ragi", True),          # Scenario 7
+    ("R a g. I", "Ragi", True),       # Scenario 8
+    ("John", "Jon", True),            # Common typo
+    ("Smith", "Smyth", True),         # Similar spelling
+    ("Mike", "Michael", False),       # Different names
+    ("Anoop", "Anoop", True),         # Exact match
+    ("Kana", "Kana", True),           # Exact match
+    ("Raghavi", "Raghavi", True),     # Exact match
+    ("AK", "AK", True),               # Short name
+    ("Rag", "Ragi", True),            # Partial match
+    ("Bob", "Robert", False),         # Completely different
+]
+
+
+@pytest.mark.parametrize("search,database,expected", NAME_CASES)
+def test_fuzzy_matching(search, database, expected):
+    """Cleaned names match when similarity >= 75%"""
+    assert fuzzy_match_name(search, database) == expected
+
+
+@pytest.mark.parametrize("search,database,expected", NAME_CASES)
+def test_fuzzy_match_many(search, database, expected):
+    """The reservation lookup path (get_reservations / cancel_reservation) agrees pair by pair"""
+    assert (0 in fuzzy_match_many(search, [database])) == expected
+
+
+def test_fuzzy_match_many_scores_by_index():
+    """Exact and fuzzy matches merge into one index -> best score map; misses are left out"""
+    scores = fuzzy_match_many("Raji", ["Bob", "R a j. I", "Ragi", "Robert"])
+
+    assert scores == {1: 100.0, 2: 75.0}
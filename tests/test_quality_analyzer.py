@@ -0,0 +1,131 @@
+"""
+Tests for Quality Analyzer
+Creates sample call data and checks its scores
+"""
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import insert
+
+from app.services.database import get_db, CallMetrics, CallQuality, ConversationTurn
+from app.services.quality_analyzer import analyze_call_quality, classify_user_turn
+
+
+def create_sample_call(worker_id: str = "main"):
+    """Create a sample call with metrics and transcript"""
+    db = get_db()
+
+    try:
+        # One clock read; every timestamp below is relative to it
+        now = datetime.now(timezone.utc)
+
+        # Worker id keeps parallel (pytest -n) runs from colliding on the same call_sid
+        call_sid = f"TEST_{worker_id}_" + now.strftime("%Y%m%d_%H%M%S_%f")
+
+        # Create call metrics
+        metrics = CallMetrics(
+            call_sid=call_sid,
+            call_start=now - timedelta(minutes=2),
+            call_end=now,
+            total_duration_sec=87.0,
+            user_turns=4,
+            agent_turns=4,
+            clarifications_needed=0,
+            booking_completed=True,
+            intent_fulfilled=True,
+            user_hung_up_early=False,
+            tools_called=["get_current_date", "check_availability", "create_reservation"],
+            total_latency_ms=1800.0,
+            api_errors=0,
+            prompt_version="v1_baseline",
+            caller_phone="+14085551234"
+        )
+        db.add(metrics)
+
+        # Create conversation turns
+        turns_data = [
+            ("agent", "Hello! Welcome to Luigi's. How can I help you today?"),
+            ("user", "I need a table for 4 people tomorrow at 7pm"),
+            ("agent", "Great! Let me check availability for 4 people tomorrow at 7pm."),
+            ("user", "Yes please"),
+            ("agent", "Perfect! We have a table available. May I have your name?"),
+            ("user", "John Smith"),
+            ("agent", "Excellent! Your reservation is confirmed for John Smith, 4 people tomorrow at 7pm. See you then!"),
+            ("user", "Thank you!")
+        ]
+
+        turn_rows = []
+        for i, (speaker, text) in enumerate(turns_data):
+            has_correction, has_confirmation = classify_user_turn(text) if speaker == "user" else (False, False)
+            turn_rows.append(dict(
+                call_sid=call_sid,
+                turn_number=i + 1,
+                speaker=speaker,
+                transcript=text,
+                timestamp=now - timedelta(seconds=(len(turns_data) - i) * 10),
+                has_correction=has_correction,
+                has_confirmation=has_confirmation
+            ))
+
+        # Metrics row first, then all turns as one Core executemany (same transaction, no ORM objects)
+        db.flush()
+        db.execute(insert(ConversationTurn.__table__), turn_rows)
+
+        db.commit()
+
+        return call_sid
+
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def call_sid(db):
+    """Sample call for this test worker (PYTEST_XDIST_WORKER is set by pytest-xdist), rolled back after the test"""
+    return create_sample_call(os.getenv("PYTEST_XDIST_WORKER", "main"))
+
+
+def test_quality_analyzer_algorithm(db, call_sid: str):
+    """Algorithm-only analysis scores the sample call and saves the result"""
+    result = asyncio.run(analyze_call_quality(call_sid, use_ai=False))
+
+    assert result["call_sid"] == call_sid
+    assert result["dimensions"] == {
+        "efficiency": 100.0,
+        "accuracy": 100.0,      # One confirmation, no corrections
+        "helpfulness": 100.0,   # Booking completed
+        "naturalness": 75.0,    # AI defaults
+        "professionalism": 75.0
+    }
+    assert result["overall_score"] == pytest.approx(93.75)
+    assert result["quality_tier"] == "Excellent"
+
+    # Quality scores saved to database, still waiting for AI scoring
+    quality = db.query(CallQuality).filter(CallQuality.call_sid == call_sid).one()
+    assert quality.overall_score == pytest.approx(93.75)
+    assert quality.needs_ai
+
+
+@pytest.mark.external
+def test_quality_analyzer_ai(db, call_sid: str):
+    """
+    AI analysis through the Claude API (slow, costs ~$0.01).
+    Deselected by default - run with: pytest -m external
+    """
+    if not os.getenv("ANTHROPIC_API_KEY"):
+        pytest.skip("ANTHROPIC_API_KEY not set")
+
+    result = asyncio.run(analyze_call_quality(call_sid, use_ai=True))
+
+    for dimension in ("naturalness", "professionalism"):
+        assert 0.0 <= result["dimensions"][dimension] <= 100.0
+    assert result["dimensions"]["accuracy"] == 100.0
+
+    # Real AI scores saved, so the call is no longer pending
+    quality = db.query(CallQuality).filter(CallQuality.call_sid == call_sid).one()
+    assert not quality.needs_ai
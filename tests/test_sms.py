@@ -0,0 +1,45 @@
+"""
+Tests for SMS service
+Sends go through a mocked Twilio client (see the mock_twilio fixture), so no real SMS
+For a real send to your own phone, run scripts/manual_sms_check.py
+"""
+import pytest
+
+from app.services import sms_service as sms_module
+
+
+@pytest.mark.parametrize("method,kwargs,build", [
+    (
+        "send_confirmation_sms",
+        {"name": "Test User", "party_size": 4, "date": "2026-01-05", "time": "19:00", "table_number": 5},
+        "_build_confirmation_message",
+    ),
+    (
+        "send_cancellation_sms",
+        {"name": "Test User", "date": "2026-01-05", "time": "19:00"},
+        "_build_cancellation_message",
+    ),
+])
+def test_sms_sends_formatted_message(mock_twilio, method, kwargs, build):
+    """Each public send API delivers its formatted message through Twilio"""
+    service = sms_module.sms_service
+
+    sent = getattr(service, method)(to_phone="+14085551234", **kwargs).result(timeout=5)
+
+    assert sent is True
+    mock_twilio.messages.create.assert_called_once_with(
+        body=getattr(service, build)(**kwargs),
+        from_="+14085550000",
+        to="+14085551234"
+    )
+
+
+def test_sms_reports_twilio_failure(mock_twilio):
+    """A Twilio error resolves the Future to False instead of raising"""
+    mock_twilio.messages.create.side_effect = RuntimeError("Twilio down")
+
+    sent = sms_module.sms_service.send_cancellation_sms(
+        to_phone="+14085551234", name="Test User", date="2026-01-05", time="19:00"
+    ).result(timeout=5)
+
+    assert sent is False